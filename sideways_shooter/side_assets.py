@@ -0,0 +1,56 @@
+import os
+
+import pygame
+
+# Images are found relative to the game, not the working directory.
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images')
+
+class Assets:
+    """A registry that loads each image and font once and shares it."""
+
+    def __init__(self):
+        """Start with nothing loaded."""
+        self.images = {}
+        self.converted = set()
+        self.fonts = {}
+
+    def image(self, name):
+        """
+        Return the shared surface for an image in the images folder.
+
+        The image is converted to the display's pixel format as soon as
+          a display exists, so blitting it doesn't convert every frame.
+        """
+        image = self.images.get(name)
+        if image is None:
+            image = pygame.image.load(os.path.join(IMAGE_DIR, name))
+            self.images[name] = image
+
+        if name not in self.converted and pygame.display.get_surface():
+            image = image.convert()
+            self.images[name] = image
+            self.converted.add(name)
+
+        return image
+
+    def font(self, size):
+        """
+        Return the shared default font at a size.
+
+        pygame's font module is started with the first font, and a cache
+          left over from before pygame was last quit is thrown away. The
+          default font is loaded directly, as SysFont(None) would after
+          scanning every font on the system.
+        """
+        if not pygame.font.get_init():
+            pygame.font.init()
+            self.fonts.clear()
+
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+# The one registry shared by every game object.
+assets = Assets()
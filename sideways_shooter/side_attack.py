@@ -1,295 +1,574 @@
-import sys
-from time import sleep
-
-import pygame
-
-from side_settings import Settings
-from side_stats import GameStats
-from side_scoreboard import Scoreboard
-from side_button import Button
-from side_ship import Ship
-from side_bullet import Bullet
-from side_alien import Alien
-from side_score import HighestScore
-
-class SideAttack:
-    """Overall class to manage game assets and behavior."""
-
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        pygame.init()
-        self.settings = Settings()
-
-        self._prepare_window()
-        self._prepare_statistics()
-        self._prepare_assets()
-        self._create_fleet()
-        self._make_buttons()
-
-    def _prepare_window(self):
-        # These lines are for fullscreen.
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        self.settings.screen_width = self.screen.get_rect().width
-        self.settings.screen_height = self.screen.get_rect().height
-
-        # These lines are for windowed.
-        # self.screen = pygame.display.set_mode(
-        #     (self.settings.screen_width, self.settings.screen_height))
-        
-        pygame.display.set_caption("Side Attack")
-
-    def _prepare_statistics(self):
-        # Create an instance to store game statistics,
-        #   and create a scoreboard.
-        self.stats = GameStats(self)
-        self.highest_score = HighestScore()
-        self.sb = Scoreboard(self)
-
-    def _prepare_assets(self):
-        # Initializes the various assets used throughout the game.
-        self.ship = Ship(self)
-        self.bullets = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
-
-    def run_game(self):
-        """Start the main loop for the game."""
-        while True:
-            self._check_events()
-            
-            if self.stats.game_active and not self.settings.paused:
-                self.ship.update()
-                self._update_bullets()
-                self._update_aliens()
-
-            self._update_screen()
-
-    def _check_events(self):
-        """Respond to keypresses and mouse events."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                self._check_keydown_events(event)
-            elif event.type == pygame.KEYUP:
-                self._check_keyup_events(event)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                self._check_play_button(mouse_pos)
-
-    def _check_keydown_events(self, event):
-        """Responds to keypresses."""
-        if event.key == pygame.K_DOWN:
-            self.ship.moving_down = True
-        if event.key == pygame.K_UP:
-            self.ship.moving_up = True
-        if event.key == pygame.K_SPACE:
-            self._fire_bullet()
-        if event.key == pygame.K_p:
-            self.settings._pause_game(not self.settings.paused)
-
-    def _check_keyup_events(self, event):
-        """Responds to key releases."""
-        if event.key == pygame.K_DOWN:
-            self.ship.moving_down = False
-        if event.key == pygame.K_UP:
-            self.ship.moving_up = False
-        if event.key == pygame.K_q:
-            sys.exit()
-    
-    def _make_buttons(self):
-        # Make the Play buttons.
-        self.easy_play_button = Button(self, "Easy")
-        self.normal_play_button = Button(self, "Normal")
-        self.hard_play_button = Button(self, "Hard")
-
-    def _check_play_button(self, mouse_pos):
-        """Start a new game when the player clicks Play."""
-        easy_button_clicked = self.easy_play_button.rect.collidepoint(mouse_pos)
-        normal_button_clicked = self.normal_play_button.rect.collidepoint(mouse_pos)
-        hard_button_clicked = self.hard_play_button.rect.collidepoint(mouse_pos)
-        if not self.stats.game_active:
-            if easy_button_clicked:
-                difficulty = 1
-            elif normal_button_clicked:
-                difficulty = 2
-            elif hard_button_clicked:
-                difficulty = 3
-            
-            if easy_button_clicked or normal_button_clicked or hard_button_clicked:
-                self._start_game()
-                self.settings.initialize_dynamic_settings(difficulty)
-
-    def _fire_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
-        if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
-
-    def _update_bullets(self):
-        """Update position of bullets and get rid of old bullets."""
-        # Update bullet positions.
-        self.bullets.update()
-
-        # Get rid of bullets that have disappeared.
-        for bullet in self.bullets.copy():
-            if bullet.rect.left >= self.settings.screen_width:
-                self.bullets.remove(bullet)
-
-        self._check_bullet_alien_collisions()
-
-    def _check_bullet_alien_collisions(self):
-        """Respond to bullet-alien collisions."""
-        # Remove any bullets and aliens that have collided.
-        collisions = pygame.sprite.groupcollide(
-                self.bullets, self.aliens, True, True)
-
-        if collisions:
-            self.stats.score += self.settings.alien_points
-            for aliens in collisions.values():
-                self.stats.score += self.settings.alien_points * len(aliens)
-            self.sb.prep_score()
-            self.sb.prep_level()
-            self.sb.prep_ships()
-            self.sb.check_high_score()
-            self.sb.check_all_time_high_score()
-
-        if not self.aliens:
-            # Destroy existing bullets and create new fleet.
-            self.bullets.empty()
-            self._create_fleet()
-            self.settings.increase_speed()
-
-            # Increase level.
-            self.stats.level += 1
-            self.sb.prep_level()
-
-    def _create_fleet(self):
-        """Create the fleet of aliens."""
-        # Make an alien.
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        available_space_y = self.settings.screen_height - (2 * alien_height)
-        number_aliens_y = available_space_y // (2 * alien_height)
-
-        # Determine the number of columns of aliens that fit on the screen.
-        ship_width = self.ship.rect.width
-        available_space_x = (self.settings.screen_width -
-                                (8 * alien_width) - ship_width)
-        number_columns = available_space_x // (2 * alien_width)
-        
-        # Create the full fleet of aliens.
-        for column_number in range(number_columns):
-            for alien_number in range(number_aliens_y):
-                self._create_alien(alien_number, column_number)
-
-    def _create_alien(self, alien_number, column_number):
-        # Create an alien and place it in the column.
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        alien.y = alien_height + 2 * alien_height * alien_number
-        alien.rect.y = alien.y
-        alien.rect.x = (self.settings.screen_width - (alien.rect.width + 2 * alien.rect.width * column_number) -
-                4 * alien.rect.width) 
-        self.aliens.add(alien)
-
-    def _update_aliens(self):
-        """
-        Check if the fleet is at an edge,
-          then update the positions of all aliens in the fleet.
-        """
-        self._check_fleet_edges()
-        self.aliens.update()
-
-        # Look for alien-ship collisions.
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
-            self._ship_hit()
-
-        # Look for aliens hitting the left of the screen.
-        self._check_aliens_left()
-
-    def _check_fleet_edges(self):
-        """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
-
-    def _change_fleet_direction(self):
-        """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.x -= self.settings.fleet_drop_speed
-        self.settings.fleet_direction *= -1
-
-    def _ship_hit(self):
-        """Respond to the ship being hit by an alien."""
-        if self.stats.ships_left > 0:
-            # Decrement ships left, and update scoreboard.
-            self.stats.ships_left -= 1
-            self.sb.prep_ships()
-
-            # Get rid of any remaining aliens and bullets.
-            self.aliens.empty()
-            self.bullets.empty()
-        
-            # Create a new fleet and center the ship.
-            self._create_fleet()
-            self.ship.center_ship()
-
-            # Pause.
-            sleep(0.5)
-        else:
-            self.stats.game_active = False
-            self.sb.check_final_high_score()
-            self.sb.check_all_time_high_score()
-            pygame.mouse.set_visible(True)
-
-    def _check_aliens_left(self):
-        """Check if any aliens have reached the left of the screen."""
-        screen_rect = self.screen.get_rect()
-        for alien in self.aliens.sprites():
-            if alien.rect.left <= screen_rect.left:
-                # Treat this the same as if the ship got hit.
-                self._ship_hit()
-                break
-    
-    def _start_game(self):
-        """Starts a game of Side Attack."""
-        # Reset the game statistics.
-        self.stats.reset_stats()
-        self.stats.game_active = True
-        self.sb.prep_score()
-
-        # Get rid of any remaining aliens and bullets.
-        self.aliens.empty()
-        self.bullets.empty()
-
-        # Create a new fleet and center the ship.
-        self._create_fleet()
-        self.ship.center_ship()
-
-        # Hide the mouse cursor.
-        pygame.mouse.set_visible(False)
-
-    def _update_screen(self):
-        """Update images on the screen, and flip to the new screen."""
-        self.screen.fill(self.settings.bg_color)
-        self.ship.blitme()
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
-        self.aliens.draw(self.screen)
-
-        # Draw the score information.
-        self.sb.show_score()
-
-        # Draw the play button if the game is inactive.
-        if not self.stats.game_active:
-            self.easy_play_button.draw_button()
-            self.normal_play_button.draw_button()
-            self.hard_play_button.draw_button()
-
-        pygame.display.flip()
-
-if __name__ == '__main__':
-    # Make a game instance, and run the game.
-    ss = SideAttack()
-    ss.run_game()
\ No newline at end of file
+import argparse
+import sys
+from collections import namedtuple
+
+import pygame
+
+from side_settings import Settings
+from side_clock import GameClock
+from side_stats import GameStats
+from side_scoreboard import Scoreboard
+from side_button import Button
+from side_ship import Ship
+from side_bullet import BulletPool
+from side_fleet import Fleet, fleet_layout
+from side_score import HighestScore
+from side_leaderboard import Leaderboard
+from side_renderer import DirtyRenderer, REDRAW_EVENTS, open_fixed_window
+from side_profiler import FrameProfiler
+from side_latency import InputLatency, TIMED_KEYS
+from side_metrics import GameMetrics
+from side_replay import InputRecorder, SIDE_ATTACK, START
+from side_state import GameState, pack_values, unpack_values
+from side_threads import run_threaded
+from side_startup import StartupProfile, init_pygame
+
+# Everything drawing a frame needs, copied out of the game after a tick.
+Snapshot = namedtuple('Snapshot', 'game_active moving ship_visible ship '
+        'bullets aliens scoreboard scoreboard_version')
+
+class SideAttack:
+    """Overall class to manage game assets and behavior."""
+
+    # Every single value that changes as Side Attack is played, saved
+    #   and restored by save_state() and restore_state().
+    STATE_VALUES = (
+        ('ticks', int),
+        ('stats.game_active', bool),
+        ('stats.ships_left', int),
+        ('stats.score', int),
+        ('stats.level', int),
+        ('stats.respawn_ticks', int),
+        ('settings.paused', bool),
+        ('settings.ship_speed', float),
+        ('settings.bullet_speed', float),
+        ('settings.alien_speed', float),
+        ('settings.fleet_direction', int),
+        ('settings.alien_points', int),
+        ('stats.high_score', int),
+        ('ship.y', float),
+        ('ship.prev_y', float),
+        ('ship.moving_up', bool),
+        ('ship.moving_down', bool),
+    )
+
+    def __init__(self, headless=False, settings=None):
+        """
+        Initialize the game, and create game resources.
+
+        A headless game never opens a window; it draws to an offscreen
+          surface and is driven through step() instead of run_game().
+          Pass settings to play with something other than the defaults.
+        """
+        self.settings = settings or Settings()
+        self.headless = headless
+        self.startup = StartupProfile(self.settings)
+        init_pygame(headless)
+        self.startup.mark('pygame')
+
+        self._prepare_window()
+        self.startup.mark('window')
+        self._prepare_statistics()
+        self.startup.mark('statistics')
+        self._prepare_assets()
+        self.startup.mark('assets')
+        self._create_fleet()
+        self.startup.mark('fleet')
+        self._make_buttons()
+        self.startup.mark('buttons')
+
+        # Count every simulated tick, and record input if asked to.
+        self.ticks = 0
+        self.latency = InputLatency(self.settings)
+        self.keys_down = dict.fromkeys(TIMED_KEYS, False)
+
+        # Only the main thread can read the keyboard, so it's only
+        #   sampled at each tick when ticks run there.
+        self.sampling = (self.settings.sample_input_per_tick and
+                not self.headless and not self.settings.threaded_simulation)
+        self.recorder = None
+        if self.settings.record_replay:
+            self.recorder = InputRecorder(self, SIDE_ATTACK,
+                    self.settings.record_replay)
+        self.startup.mark('input')
+
+    def _prepare_window(self):
+        self.renderer = None
+        self.scaled = None
+        self.mouse_visible = True
+        if self.headless:
+            # Simulate on an offscreen surface at the configured size.
+            self.screen = pygame.Surface(
+                (self.settings.screen_width, self.settings.screen_height))
+            return
+
+        if self.settings.fixed_resolution:
+            # Play at the configured size, shown at the quality's size.
+            self.screen, self.scaled = open_fixed_window(self.settings)
+        else:
+            # These lines are for fullscreen.
+            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+            self.settings.screen_width = self.screen.get_rect().width
+            self.settings.screen_height = self.screen.get_rect().height
+
+        # These lines are for windowed.
+        # self.screen = pygame.display.set_mode(
+        #     (self.settings.screen_width, self.settings.screen_height))
+        
+        pygame.display.set_caption("Side Attack")
+
+        # Scaling touches every pixel anyway, so only draw what changed
+        #   when the game is drawn on the window itself.
+        if self.settings.dirty_rendering and not self.scaled:
+            self.renderer = DirtyRenderer(self.screen, self.settings.bg_color)
+
+    def _prepare_statistics(self):
+        # Create an instance to store game statistics,
+        #   and create a scoreboard.
+        self.stats = GameStats(self)
+        # Headless games keep their scores to themselves.
+        if self.headless:
+            self.leaderboard = None
+        else:
+            self.leaderboard = Leaderboard(self.settings.leaderboard_file)
+            self.leaderboard.import_high_score(self.settings.high_score_file)
+        self.highest_score = HighestScore(self.leaderboard)
+        self.sb = Scoreboard(self)
+
+    def _prepare_assets(self):
+        # Initializes the various assets used throughout the game.
+        self.ship = Ship(self)
+        self.bullets = BulletPool(self)
+        self.aliens = Fleet(self)
+        self.profiler = FrameProfiler(self.settings,
+                ('events', 'ship', 'bullets', 'collisions', 'aliens', 'draw',
+                    'flip'),
+                ('aliens', 'bullets'))
+        self.metrics = GameMetrics(self.settings, 'side_attack', self.stats,
+                self.leaderboard)
+
+    def run_game(self):
+        """Start the main loop for the game."""
+        if self.settings.threaded_simulation:
+            run_threaded(self)
+            return
+
+        self.clock = GameClock(self.settings)
+        while True:
+            # Wait for the next frame before timing it.
+            ticks = self.clock.ticks_due()
+            self.profiler.start_frame()
+
+            self._check_events()
+            self.profiler.mark('events')
+            for _ in range(ticks):
+                self._update_game()
+            self._update_screen(self.clock.alpha)
+
+    def step(self, n_ticks=1, inputs=()):
+        """
+        Advance the game n_ticks without pumping events or drawing.
+
+        inputs holds the actions applied on every tick: 'up' and 'down'
+          steer the ship, and 'fire' shoots whenever a bullet is free.
+        Returns True while the game is still active.
+        """
+        self.ship.moving_up = 'up' in inputs
+        self.ship.moving_down = 'down' in inputs
+        fire = 'fire' in inputs
+
+        for _ in range(n_ticks):
+            if not self.stats.game_active:
+                break
+            if fire:
+                self._fire_bullet()
+            self._update_game()
+
+        return self.stats.game_active
+
+    def save_state(self):
+        """
+        Return everything needed to put the game back at this tick.
+
+        Takes a few array copies, so it's cheap enough to do often.
+          The all time high score isn't part of it; rewinding a game
+          doesn't take back a record.
+        """
+        return GameState(self.ticks, pack_values(self, self.STATE_VALUES),
+                self.bullets.state(), self.aliens.state())
+
+    def restore_state(self, state):
+        """Put the game back the way save_state() found it."""
+        unpack_values(self, self.STATE_VALUES, state.values)
+        self.bullets.restore(state.bullets)
+        self.aliens.restore(state.sprites)
+        self.ship.rect.y = self.ship.y
+
+        # Show the restored values on the scoreboard.
+        self.sb.prep_score()
+        self.sb.prep_high_score()
+        self.sb.prep_level()
+        self.sb.prep_ships()
+
+    def _update_game(self):
+        """Advance the simulation by a single tick."""
+        if self.sampling:
+            self._sample_keys()
+            self.profiler.mark('events')
+
+        self.ticks += 1
+        if self.stats.game_active and not self.settings.paused:
+            if self.stats.respawn_ticks:
+                # Hold everything still while the new ship arrives.
+                self.stats.respawn_ticks -= 1
+                self.latency.discard_seen()
+                return
+
+            self.ship.update()
+            self.profiler.mark('ship')
+            self._update_bullets()
+            self._update_aliens()
+            self.profiler.mark('aliens')
+            self.latency.tick_done()
+        else:
+            self.latency.discard_seen()
+
+    def _check_events(self):
+        """Respond to keypresses and mouse events."""
+        self.latency.read_input()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self._quit()
+            elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                if event.key in TIMED_KEYS:
+                    if self.sampling:
+                        # These keys are read at every tick instead.
+                        continue
+                    self.latency.input_seen()
+                if self.recorder:
+                    self.recorder.record_event(event)
+                if event.type == pygame.KEYDOWN:
+                    self._check_keydown_events(event)
+                else:
+                    self._check_keyup_events(event)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if self.scaled:
+                    mouse_pos = self.scaled.mouse_pos()
+                else:
+                    mouse_pos = pygame.mouse.get_pos()
+                self._check_play_button(mouse_pos)
+            elif event.type in REDRAW_EVENTS and self.renderer:
+                self.renderer.invalidate()
+
+    def _sample_keys(self):
+        """Read the keyboard, and respond to any timed key that changed."""
+        pygame.event.pump()
+        pressed = pygame.key.get_pressed()
+        self.latency.read_input()
+        for key, was_down in self.keys_down.items():
+            if pressed[key] == was_down:
+                continue
+            self.keys_down[key] = pressed[key]
+            self.latency.input_seen()
+
+            # Handle the change just like its event, so it's recorded
+            #   and replayed the same way too.
+            if pressed[key]:
+                event = pygame.event.Event(pygame.KEYDOWN, key=key)
+            else:
+                event = pygame.event.Event(pygame.KEYUP, key=key)
+            if self.recorder:
+                self.recorder.record_event(event)
+            if pressed[key]:
+                self._check_keydown_events(event)
+            else:
+                self._check_keyup_events(event)
+
+    def _check_keydown_events(self, event):
+        """Responds to keypresses."""
+        if event.key == pygame.K_DOWN:
+            self.ship.moving_down = True
+        if event.key == pygame.K_UP:
+            self.ship.moving_up = True
+        if event.key == pygame.K_F3:
+            self.profiler.toggle_overlay()
+        if event.key == pygame.K_SPACE:
+            self._fire_bullet()
+        if event.key == pygame.K_p:
+            self.settings._pause_game(not self.settings.paused)
+
+    def _check_keyup_events(self, event):
+        """Responds to key releases."""
+        if event.key == pygame.K_DOWN:
+            self.ship.moving_down = False
+        if event.key == pygame.K_UP:
+            self.ship.moving_up = False
+        if event.key == pygame.K_q:
+            self._quit()
+    
+    def _make_buttons(self):
+        # Make the Play buttons.
+        self.easy_play_button = Button(self, "Easy")
+        self.normal_play_button = Button(self, "Normal")
+        self.hard_play_button = Button(self, "Hard")
+
+    def _check_play_button(self, mouse_pos):
+        """Start a new game when the player clicks Play."""
+        easy_button_clicked = self.easy_play_button.rect.collidepoint(mouse_pos)
+        normal_button_clicked = self.normal_play_button.rect.collidepoint(mouse_pos)
+        hard_button_clicked = self.hard_play_button.rect.collidepoint(mouse_pos)
+        if not self.stats.game_active:
+            if easy_button_clicked:
+                difficulty = 1
+            elif normal_button_clicked:
+                difficulty = 2
+            elif hard_button_clicked:
+                difficulty = 3
+            
+            if easy_button_clicked or normal_button_clicked or hard_button_clicked:
+                if self.recorder:
+                    self.recorder.record(START, difficulty)
+                self.start_game(difficulty)
+
+    def start_game(self, difficulty=2):
+        """Start a new game at the given difficulty."""
+        self._start_game()
+        self.settings.initialize_dynamic_settings(difficulty)
+        self.difficulty = difficulty
+        self.start_tick = self.ticks
+
+    def _record_game(self, completed=True):
+        """Add the game that just ended to the leaderboard."""
+        if self.leaderboard:
+            self.leaderboard.record(self.difficulty, self.stats.level,
+                    self.stats.score,
+                    (self.ticks - self.start_tick) / self.settings.tick_rate,
+                    completed)
+
+    def _quit(self):
+        """Record any game still being played, and quit."""
+        if self.stats.game_active:
+            self._record_game(completed=False)
+        sys.exit()
+
+    def _fire_bullet(self):
+        """Fire a new bullet from the ship if one is allowed."""
+        if self.stats.respawn_ticks:
+            return
+        if len(self.bullets) < self.settings.bullets_allowed:
+            self.bullets.fire(self.ship.rect.midleft)
+
+    def _update_bullets(self):
+        """Update position of bullets and get rid of old bullets."""
+        # Update bullet positions, and get rid of bullets that have
+        #   disappeared.
+        self.bullets.update()
+        self.profiler.mark('bullets')
+
+        self._check_bullet_alien_collisions()
+        self.profiler.mark('collisions')
+
+    def _check_bullet_alien_collisions(self):
+        """Respond to bullet-alien collisions."""
+        # Remove any bullets and aliens that have collided.
+        collisions = self.aliens.collide_bullets(self.bullets)
+
+        if collisions:
+            self.stats.score += self.settings.alien_points
+            for aliens in collisions.values():
+                self.stats.score += self.settings.alien_points * len(aliens)
+            self.sb.prep_score()
+            self.sb.check_high_score()
+            self.sb.check_all_time_high_score()
+
+        if not self.aliens:
+            # Destroy existing bullets and create new fleet.
+            self.bullets.empty()
+            self._create_fleet()
+            self.settings.increase_speed()
+
+            # Increase level.
+            self.stats.level += 1
+            self.sb.prep_level()
+
+    def _create_fleet(self):
+        """Create the fleet of aliens."""
+        # Every fleet for this screen looks the same, so its layout is
+        #   only worked out the first time.
+        layout = fleet_layout(self.settings.screen_width,
+                self.settings.screen_height, self.aliens.width,
+                self.aliens.height, self.ship.rect.width)
+        self.aliens.spawn_layout(layout)
+
+    def _update_aliens(self):
+        """
+        Check if the fleet is at an edge,
+          then update the positions of all aliens in the fleet.
+        """
+        self._check_fleet_edges()
+        self.aliens.update()
+
+        # Look for alien-ship collisions.
+        if self.aliens.collide_rect(self.ship.rect):
+            self._ship_hit()
+
+        # Look for aliens hitting the left of the screen.
+        self._check_aliens_left()
+
+    def _check_fleet_edges(self):
+        """Respond appropriately if any aliens have reached an edge."""
+        if self.aliens.check_edges():
+            self._change_fleet_direction()
+
+    def _change_fleet_direction(self):
+        """Drop the entire fleet and change the fleet's direction."""
+        self.aliens.drop(self.settings.fleet_drop_speed)
+        self.settings.fleet_direction *= -1
+
+    def _ship_hit(self):
+        """Respond to the ship being hit by an alien."""
+        if self.stats.ships_left > 0:
+            # Decrement ships left, and update scoreboard.
+            self.stats.ships_left -= 1
+            self.sb.prep_ships()
+
+            # Get rid of any remaining aliens and bullets.
+            self.aliens.empty()
+            self.bullets.empty()
+        
+            # Create a new fleet and center the ship.
+            self._create_fleet()
+            self.ship.center_ship()
+
+            # Pause while the new ship arrives.
+            self.stats.respawn_ticks = round(
+                self.settings.respawn_time * self.settings.tick_rate)
+        else:
+            self.stats.game_active = False
+            self.sb.check_final_high_score()
+            self.sb.check_all_time_high_score()
+            self._record_game()
+
+    def _check_aliens_left(self):
+        """Check if any aliens have reached the left of the screen."""
+        screen_rect = self.screen.get_rect()
+        if self.aliens.reached_left(screen_rect.left):
+            # Treat this the same as if the ship got hit.
+            self._ship_hit()
+    
+    def _start_game(self):
+        """Starts a game of Side Attack."""
+        # Reset the game statistics.
+        self.stats.reset_stats()
+        self.stats.game_active = True
+        self.sb.prep_score()
+        self.sb.prep_level()
+        self.sb.prep_ships()
+
+        # Get rid of any remaining aliens and bullets.
+        self.aliens.empty()
+        self.bullets.empty()
+
+        # Create a new fleet and center the ship.
+        self._create_fleet()
+        self.ship.center_ship()
+
+    def _set_mouse_visible(self, visible):
+        """
+        Show or hide the mouse cursor when there is a window.
+
+        Only called while drawing, since the cursor can only be changed
+          from the main thread on some platforms, and ticks may run on
+          another.
+        """
+        if not self.headless and visible != self.mouse_visible:
+            pygame.mouse.set_visible(visible)
+            self.mouse_visible = visible
+
+    def _take_snapshot(self):
+        """Copy everything drawing needs out of the game."""
+        # Blink the new ship while it arrives.
+        blink_ticks = max(1, self.settings.tick_rate // 8)
+        return Snapshot(
+            game_active=self.stats.game_active,
+            moving=self.stats.game_active and not self.settings.paused,
+            ship_visible=not (self.stats.respawn_ticks // blink_ticks) % 2,
+            ship=(self.ship.prev_y, self.ship.y),
+            bullets=self.bullets.snapshot(),
+            aliens=self.aliens.snapshot(),
+            scoreboard=self.sb.images(),
+            scoreboard_version=self.sb.version,
+        )
+
+    def _update_screen(self, alpha=1.0, snapshot=None):
+        """
+        Update images on the screen, and flip to the new screen.
+
+        alpha is how far the frame is between the last tick and the next.
+          The game is drawn as it is now, or as it was in snapshot.
+        """
+        if snapshot is None:
+            snapshot = self._take_snapshot()
+
+        # Only draw between the last two ticks while the game is moving.
+        if not snapshot.moving:
+            alpha = 1.0
+
+        if self.renderer:
+            self.renderer.begin_frame((snapshot.scoreboard_version,
+                    snapshot.game_active, self.profiler.version))
+        else:
+            self.screen.fill(self.settings.bg_color)
+
+        sprite_rects = []
+        if snapshot.ship_visible:
+            sprite_rects.append(self.ship.blitme(alpha, snapshot.ship))
+        sprite_rects += self.bullets.draw(self.screen, alpha, snapshot.bullets)
+        sprite_rects += self.aliens.draw(self.screen, alpha, snapshot.aliens)
+
+        # Draw the score information.
+        overlay_rects = self.sb.show_score(snapshot.scoreboard)
+
+        # Draw the play button if the game is inactive.
+        if not snapshot.game_active:
+            overlay_rects.append(self.easy_play_button.draw_button())
+            overlay_rects.append(self.normal_play_button.draw_button())
+            overlay_rects.append(self.hard_play_button.draw_button())
+
+        # Draw the profiler overlay if it's turned on.
+        overlay_rects += self.profiler.draw_overlay(self.screen)
+        self.profiler.mark('draw')
+
+        if self.renderer:
+            self.renderer.end_frame(sprite_rects, overlay_rects)
+        elif self.scaled:
+            self.scaled.present()
+        elif not self.headless:
+            pygame.display.flip()
+
+        # Show the cursor whenever the game isn't moving.
+        self._set_mouse_visible(not snapshot.moving)
+        self.latency.frame_shown()
+        self.startup.first_frame()
+        self.profiler.mark('flip')
+        self.profiler.end_frame(aliens=len(snapshot.aliens[0]),
+                bullets=len(snapshot.bullets[0]))
+        self.metrics.frame_done(aliens=len(snapshot.aliens[0]),
+                bullets=len(snapshot.bullets[0]))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play Side Attack.")
+    parser.add_argument('--startup-profile', action='store_true',
+            help="print how long each part of starting up took")
+    parser.add_argument('--quality', choices=('low', 'medium', 'high'),
+            help="play at a fixed size, scaled up to fill the display")
+    args = parser.parse_args()
+    settings = Settings()
+    settings.startup_profile = args.startup_profile
+    if args.quality:
+        settings.fixed_resolution = True
+        settings.render_quality = args.quality
+
+    # Make a game instance, and run the game.
+    ss = SideAttack(settings=settings)
+    ss.run_game()
@@ -0,0 +1,231 @@
+"""
+Play many headless games of Side Attack across a pool of processes.
+
+Each game is played by a scripted policy, optionally with some settings
+  overridden, and the levels, scores and survival times it reaches are
+  summarized for every difficulty and combination of overrides. The
+  game itself has no randomness, so each game's seed varies how long
+  the policy takes to react, and so how the game plays out.
+
+    python side_batch.py --games 200 --policy tracker \\
+        --set alien_speed_per_second=200,240,280 --set speedup_scale=1.05,1.1
+"""
+import argparse
+import importlib
+import itertools
+import json
+import os
+import random
+from multiprocessing import Pool
+
+# Never open a window, even where there is a display.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+
+def idle(game, rng):
+    """Sit still and never fire."""
+    return ()
+
+# Idle games all play out the same, however long each decision lasts.
+idle.deterministic = True
+
+def random_player(game, rng):
+    """Fire constantly while drifting up and down at random."""
+    return ('fire', rng.choice(('up', 'down', None)))
+
+def tracker(game, rng):
+    """Fire constantly while lining up with the nearest alien."""
+    fleet = game.aliens
+    if not len(fleet):
+        return ('fire',)
+
+    # Aim for the closest alien in the column nearest the ship.
+    alive = fleet.alive
+    xs = fleet.x[alive]
+    ys = fleet.y[alive][xs == xs.min()] + fleet.height / 2
+    target = ys[np.argmin(np.abs(ys - game.ship.rect.centery))]
+    if target < game.ship.rect.centery - 2:
+        return ('fire', 'up')
+    if target > game.ship.rect.centery + 2:
+        return ('fire', 'down')
+    return ('fire',)
+
+POLICIES = {
+    'idle': idle,
+    'random': random_player,
+    'tracker': tracker,
+}
+
+def load_policy(name):
+    """Return a built-in policy, or one named as module:function."""
+    if name in POLICIES:
+        return POLICIES[name]
+    module, function = name.split(':')
+    return getattr(importlib.import_module(module), function)
+
+def apply_overrides(settings, overrides):
+    """
+    Set overridden settings, refusing any Settings doesn't have.
+
+    Settings a game sets again when it starts, from its difficulty and
+      the starting speeds, are refused too; override the starting speeds
+      instead, such as alien_speed_per_second.
+    """
+    for name, value in overrides.items():
+        if not hasattr(settings, name):
+            raise ValueError(f"Unknown setting {name!r}.")
+        if name in settings.DYNAMIC_SETTINGS:
+            raise ValueError(f"{name!r} is set when each game starts; "
+                    "override the starting speed it comes from instead.")
+        setattr(settings, name, value)
+
+def play_game(job):
+    """Play one headless game to the end, and return how it went."""
+    import pygame
+
+    from side_attack import SideAttack
+    from side_settings import Settings
+
+    difficulty, overrides, policy_name, seed, max_ticks, decision_ticks = job
+    policy = load_policy(policy_name)
+    rng = random.Random(seed)
+
+    # Settings are read as the game is built, so override them first.
+    settings = Settings()
+    apply_overrides(settings, overrides)
+    game = SideAttack(headless=True, settings=settings)
+    try:
+        game.start_game(difficulty)
+
+        # Each decision lasts decision_ticks on average, give or take,
+        #   like a player's reactions.
+        while game.ticks < max_ticks:
+            ticks = rng.randint(1, 2 * decision_ticks - 1)
+            if not game.step(ticks, policy(game, rng)):
+                break
+    finally:
+        # Shut pygame down between games, so a worker holds nothing of
+        #   SDL's while it waits for its next game or hands back a result.
+        pygame.quit()
+
+    return {
+        'difficulty': difficulty,
+        'overrides': overrides,
+        'level': game.stats.level,
+        'score': game.stats.score,
+        'survival': game.ticks / game.settings.tick_rate,
+        'finished': not game.stats.game_active,
+    }
+
+def _parse_value(text):
+    """Read an override value as JSON, falling back to a plain string."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+def override_grid(options):
+    """Turn name=value,value options into every combination of overrides."""
+    names, choices = [], []
+    for option in options:
+        name, values = option.split('=', 1)
+        names.append(name)
+        choices.append([_parse_value(value) for value in values.split(',')])
+    return [dict(zip(names, combo)) for combo in itertools.product(*choices)]
+
+def summarize(results):
+    """Group results by difficulty and overrides, and describe each group."""
+    groups = {}
+    for result in results:
+        key = (result['difficulty'],
+                json.dumps(result['overrides'], sort_keys=True))
+        groups.setdefault(key, []).append(result)
+
+    summary = []
+    for (difficulty, overrides), group in sorted(groups.items()):
+        entry = {'difficulty': difficulty, 'overrides': json.loads(overrides),
+                'games': len(group),
+                'finished': sum(result['finished'] for result in group)}
+        for measure in ('level', 'score', 'survival'):
+            values = np.array([result[measure] for result in group])
+            entry[measure] = {
+                'mean': float(values.mean()),
+                'p10': float(np.percentile(values, 10)),
+                'p50': float(np.percentile(values, 50)),
+                'p90': float(np.percentile(values, 90)),
+                'max': float(values.max()),
+            }
+        summary.append(entry)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--games', type=int, default=100,
+            help="games per difficulty and combination of overrides")
+    parser.add_argument('--difficulty', type=int, nargs='+',
+            default=[1, 2, 3], help="difficulties to play")
+    parser.add_argument('--policy', default='tracker',
+            help="built-in policy (" + ", ".join(POLICIES) + ") or "
+                "module:function")
+    parser.add_argument('--set', action='append', default=[],
+            metavar='NAME=VALUES',
+            help="override a setting with each comma-separated value")
+    parser.add_argument('--max-seconds', type=float, default=600,
+            help="stop games that survive this long in game time")
+    parser.add_argument('--decision-ticks', type=int, default=4,
+            help="ticks between each decision the policy makes")
+    parser.add_argument('--processes', type=int, default=None,
+            help="worker processes (default: one per core)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the summary to this JSON file")
+    args = parser.parse_args()
+
+    from side_settings import Settings
+    settings = Settings()
+    max_ticks = int(args.max_seconds * settings.tick_rate)
+
+    grid = override_grid(args.set)
+    try:
+        for overrides in grid:
+            apply_overrides(settings, overrides)
+    except ValueError as e:
+        parser.error(str(e))
+
+    games = args.games
+    if getattr(load_policy(args.policy), 'deterministic', False):
+        print(f"The {args.policy} policy plays every game the same, "
+                "so only one game is played for each group.")
+        games = 1
+
+    jobs = []
+    seed = args.seed
+    for overrides in grid:
+        for difficulty in args.difficulty:
+            for _ in range(games):
+                jobs.append((difficulty, overrides, args.policy, seed,
+                        max_ticks, args.decision_ticks))
+                seed += 1
+
+    # A few chunks per process keeps every core busy to the end.
+    processes = args.processes or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (4 * processes))
+    with Pool(processes) as pool:
+        results = list(pool.imap_unordered(play_game, jobs, chunksize))
+
+    summary = summarize(results)
+    for entry in summary:
+        print(f"difficulty {entry['difficulty']} {entry['overrides']}: "
+                f"{entry['games']} games, "
+                f"level p50 {entry['level']['p50']:.0f} "
+                f"p90 {entry['level']['p90']:.0f}, "
+                f"score p50 {entry['score']['p50']:.0f}, "
+                f"survival p50 {entry['survival']['p50']:.1f} s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+Benchmark Side Attack and Target Practice in scripted scenarios.
+
+Each scenario runs a real headless game: every frame advances the
+  simulation by a frame's worth of ticks and then draws to an offscreen
+  surface. Results can be saved as a baseline and later runs compared
+  against it, failing if any scenario got slower than the threshold.
+
+    python side_benchmark.py --save-baseline baseline.json
+    python side_benchmark.py --baseline baseline.json --threshold 0.1
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+from time import perf_counter
+
+# Never open a window, even where there is a display.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+
+from side_settings import Settings
+from side_attack import SideAttack
+from side_target_practice import TargetPractice
+
+def _settings(width=1920, height=1080):
+    """Return default settings for a screen of the given size."""
+    settings = Settings()
+    settings.screen_width = width
+    settings.screen_height = height
+    return settings
+
+def _weave(game, frame):
+    """Fire constantly while moving up and down the screen."""
+    if (frame // 90) % 2:
+        return {'fire', 'up'}
+    return {'fire', 'down'}
+
+def _track_target(game, frame):
+    """Fire constantly while keeping the ship level with the target."""
+    target = game.target.sprites()[0]
+    if target.rect.centery < game.ship.rect.centery:
+        return {'fire', 'up'}
+    return {'fire', 'down'}
+
+def _start_normal(game):
+    """Start a game of Side Attack at normal difficulty."""
+    game.start_game(2)
+
+# Each scenario is how to build its game, how to start every game
+#   played on it, and the script that picks each frame's inputs.
+
+def fleet(width, height):
+    """A full fleet at the given resolution."""
+    def build():
+        return SideAttack(headless=True, settings=_settings(width, height))
+    return build, _start_normal, _weave
+
+def late_levels():
+    """A fleet at level 11, after ten rounds of increase_speed()."""
+    def build():
+        return SideAttack(headless=True, settings=_settings())
+    def start(game):
+        game.start_game(2)
+        for _ in range(10):
+            game.settings.increase_speed()
+        game.stats.level = 11
+        game.sb.prep_level()
+    return build, start, _weave
+
+def bullet_storm():
+    """A full fleet with hundreds of bullets in the air."""
+    def build():
+        settings = _settings()
+        settings.bullets_allowed = 500
+        return SideAttack(headless=True, settings=settings)
+    return build, _start_normal, _weave
+
+def fast_target():
+    """Target Practice with the target already moving very fast."""
+    def build():
+        return TargetPractice(headless=True, settings=_settings())
+    def start(game):
+        game.start_game()
+        game.settings.target_speed *= 8
+    return build, start, _track_target
+
+SCENARIOS = {
+    'fleet_1080p': fleet(1920, 1080),
+    'fleet_1440p': fleet(2560, 1440),
+    'fleet_4k': fleet(3840, 2160),
+    'level_11': late_levels(),
+    'bullet_storm': bullet_storm(),
+    'fast_target': fast_target(),
+}
+
+def run_scenario(name, frames):
+    """Run one scenario, and return its measurements."""
+    build, new_game, script = SCENARIOS[name]
+    game = build()
+    new_game(game)
+    ticks_per_frame = max(1, game.settings.tick_rate // game.settings.max_fps)
+
+    frame_times = np.zeros(frames)
+    sim_time = 0.0
+    gc.collect()
+    collections = sum(stats['collections'] for stats in gc.get_stats())
+    blocks = sys.getallocatedblocks()
+
+    for frame in range(frames):
+        if not game.stats.game_active:
+            # Keep the load steady by starting the scenario over
+            #   whenever a game ends.
+            new_game(game)
+
+        start = perf_counter()
+        game.step(ticks_per_frame, script(game, frame))
+        simulated = perf_counter()
+        game._update_screen()
+        end = perf_counter()
+
+        sim_time += simulated - start
+        frame_times[frame] = end - start
+
+    blocks = sys.getallocatedblocks() - blocks
+    collections = (sum(stats['collections'] for stats in gc.get_stats()) -
+            collections)
+
+    frame_ms = frame_times * 1000
+    return {
+        'ticks_per_sec': frames * ticks_per_frame / sim_time,
+        'frame_ms_p50': float(np.percentile(frame_ms, 50)),
+        'frame_ms_p95': float(np.percentile(frame_ms, 95)),
+        'frame_ms_p99': float(np.percentile(frame_ms, 99)),
+        # Python can't count allocations directly, so report how many
+        #   memory blocks each frame kept and how often the collector ran.
+        'blocks_per_frame': blocks / frames,
+        'gc_per_1000_frames': collections * 1000 / frames,
+    }
+
+def compare(results, baseline, threshold):
+    """Return a description of every scenario that got slower."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        if result['ticks_per_sec'] < old['ticks_per_sec'] * (1 - threshold):
+            regressions.append(f"{name}: {result['ticks_per_sec']:.0f} "
+                    f"ticks/sec, baseline {old['ticks_per_sec']:.0f}")
+        if result['frame_ms_p99'] > old['frame_ms_p99'] * (1 + threshold):
+            regressions.append(f"{name}: p99 frame {result['frame_ms_p99']:.2f}"
+                    f" ms, baseline {old['frame_ms_p99']:.2f} ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('scenarios', nargs='*', metavar='scenario',
+            help="scenarios to run: " + ", ".join(SCENARIOS) +
+                " (default: all)")
+    parser.add_argument('--frames', type=int, default=600,
+            help="frames to run in each scenario")
+    parser.add_argument('--baseline', help="baseline JSON to compare with")
+    parser.add_argument('--threshold', type=float, default=0.1,
+            help="allowed slowdown before a scenario fails (0.1 = 10%%)")
+    parser.add_argument('--save-baseline', help="write the results here")
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}")
+
+    results = {}
+    print(f"{'scenario':<14}{'ticks/s':>10}{'p50 ms':>9}{'p95 ms':>9}"
+            f"{'p99 ms':>9}{'blocks/f':>10}{'gc/1k f':>9}")
+    for name in args.scenarios or SCENARIOS:
+        result = run_scenario(name, args.frames)
+        results[name] = result
+        print(f"{name:<14}{result['ticks_per_sec']:>10.0f}"
+                f"{result['frame_ms_p50']:>9.2f}{result['frame_ms_p95']:>9.2f}"
+                f"{result['frame_ms_p99']:>9.2f}"
+                f"{result['blocks_per_frame']:>10.1f}"
+                f"{result['gc_per_1000_frames']:>9.1f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,31 +1,174 @@
-import pygame
-from pygame.sprite import Sprite
-
-class Bullet(Sprite):
-    """A class to manage bullets fired from the ship."""
-
-    def __init__(self, ss_game):
-        """Create a bullet object at the ship's current position."""
-        super().__init__()
-        self.screen = ss_game.screen
-        self.settings = ss_game.settings
-        self.color = self.settings.bullet_color
-
-        # Create a bullet rect at (0, 0) and then set correct position.
-        self.rect = pygame.Rect(0, 0, self.settings.bullet_width,
-            self.settings.bullet_height)
-        self.rect.midleft = ss_game.ship.rect.midleft
-
-        # Store the bullet's position as a decimal value.
-        self.x = float(self.rect.x)
-
-    def update(self):
-        """Move the bullet up the screen."""
-        # Update the decimal position of the bullet.
-        self.x += self.settings.bullet_speed
-        # Update the rect position.
-        self.rect.x = self.x
-
-    def draw_bullet(self):
-        """Draw the bullet to the screen."""
-        pygame.draw.rect(self.screen, self.color, self.rect)
\ No newline at end of file
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+class BulletPool:
+    """
+    A class to manage bullets fired from the ship.
+
+    Bullets live in preallocated slots instead of being created and
+      thrown away for every shot. A slot is reused as soon as its bullet
+      is gone, and the pool grows only if more bullets are allowed.
+    """
+
+    def __init__(self, ss_game):
+        """Create an empty pool with room for every allowed bullet."""
+        self.screen = ss_game.screen
+        self.settings = ss_game.settings
+        self.color = self.settings.bullet_color
+        self.width = self.settings.bullet_width
+        self.height = self.settings.bullet_height
+
+        # Every bullet looks the same, so draw them all from one image.
+        self.image = pygame.Surface((self.width, self.height))
+        self.image.fill(self.color)
+
+        # Each bullet's decimal position, where it was on the previous
+        #   tick, its whole-pixel left edge, and its top edge, which
+        #   never changes.
+        self.x = np.zeros(0)
+        self.prev_x = np.zeros(0)
+        self.left = np.zeros(0, dtype=np.int64)
+        self.y = np.zeros(0, dtype=np.int64)
+
+        # Which slots hold a bullet, the slots in the order their
+        #   bullets were fired, and the slots ready for reuse.
+        self.active = np.zeros(0, dtype=bool)
+        self.order = []
+        self.free = []
+        self.count = 0
+        self._grow(self.settings.bullets_allowed)
+
+    def _grow(self, capacity):
+        """Add empty slots until the pool holds capacity bullets."""
+        old = len(self.active)
+        extra = capacity - old
+        self.x = np.concatenate((self.x, np.zeros(extra)))
+        self.prev_x = np.concatenate((self.prev_x, np.zeros(extra)))
+        self.left = np.concatenate(
+            (self.left, np.zeros(extra, dtype=np.int64)))
+        self.y = np.concatenate((self.y, np.zeros(extra, dtype=np.int64)))
+        self.active = np.concatenate((self.active, np.zeros(extra, dtype=bool)))
+
+        # Hand out the lowest free slots first.
+        self.free = list(range(capacity - 1, old - 1, -1)) + self.free
+
+    def __len__(self):
+        """Return the number of bullets in flight."""
+        return self.count
+
+    def fire(self, midleft):
+        """Fire a bullet whose middle left is at the given point."""
+        if not self.free:
+            self._grow(max(self.settings.bullets_allowed,
+                    2 * len(self.active), 1))
+
+        slot = self.free.pop()
+        left, centery = midleft
+        self.x[slot] = self.prev_x[slot] = self.left[slot] = left
+        self.y[slot] = centery - self.height // 2
+        self.active[slot] = True
+        self.order.append(slot)
+        self.count += 1
+
+    def kill(self, slot):
+        """Remove a single bullet and free its slot."""
+        self.active[slot] = False
+        self.order.remove(slot)
+        self.free.append(slot)
+        self.count -= 1
+
+    def empty(self):
+        """Remove every bullet."""
+        self.active[:] = False
+        self.order = []
+        self.free = list(range(len(self.active) - 1, -1, -1))
+        self.count = 0
+
+    def slots(self):
+        """Return the slots holding bullets, in the order they were fired."""
+        return list(self.order)
+
+    def rect(self, slot):
+        """Return the rect of the bullet in a slot."""
+        return pygame.Rect(int(self.left[slot]), int(self.y[slot]),
+                self.width, self.height)
+
+    def update(self):
+        """
+        Move every bullet across the screen.
+
+        Bullets that have left the screen are removed in the same pass,
+          and the number removed is returned.
+        """
+        self.move()
+        return self.cull()
+
+    def move(self):
+        """Move every bullet across the screen, and keep where it was."""
+        if not self.count:
+            return
+
+        # Update the decimal position of every bullet at once. Bullets
+        #   never have a negative position, so adding a half and
+        #   truncating rounds them the same way pygame.Rect does.
+        self.prev_x[:] = self.x
+        self.x += self.settings.bullet_speed
+        self.left = (self.x + 0.5).astype(np.int64)
+
+    def cull(self):
+        """Remove the bullets that have left the screen, and count them."""
+        if not self.count:
+            return 0
+
+        gone = np.flatnonzero(
+                self.active & (self.left >= self.settings.screen_width))
+        for slot in gone.tolist():
+            self.kill(slot)
+        return len(gone)
+
+    def prev_left(self, slot):
+        """Return the whole-pixel left edge of a bullet on the last tick."""
+        return int(self.prev_x[slot] + 0.5)
+
+    def snapshot(self):
+        """
+        Return read-only copies of where each bullet was and is now.
+
+        Bullets are listed in the order they were fired, as last-tick
+          positions, current positions and top edges.
+        """
+        slots = self.slots()
+        arrays = (self.prev_x[slots], self.x[slots], self.y[slots])
+        for array in arrays:
+            array.flags.writeable = False
+        return arrays
+
+    def state(self):
+        """Return copies of every slot, for restore() to put back later."""
+        return (self.x.copy(), self.prev_x.copy(), self.left.copy(),
+                self.y.copy(), self.active.copy(), np.array(self.order),
+                np.array(self.free))
+
+    def restore(self, state):
+        """Put every slot back the way state() found it."""
+        x, prev_x, left, y, active, order, free = state
+        self.x, self.prev_x, self.left = x.copy(), prev_x.copy(), left.copy()
+        self.y, self.active = y.copy(), active.copy()
+        self.order = order.tolist()
+        self.free = free.tolist()
+        self.count = len(self.order)
+
+    def draw(self, surface, alpha=1.0, snapshot=None):
+        """
+        Draw each bullet alpha of the way from its last tick to this one.
+
+        Every bullet is blitted from the shared image in a single batch.
+          Draws the bullets in snapshot instead of the pool's own if one is
+          given. Returns the rects that were drawn.
+        """
+        prev_xs, xs, ys = snapshot or self.snapshot()
+        lefts = prev_xs + (xs - prev_xs) * alpha + 0.5
+        positions = zip(lefts.astype(np.int64).tolist(), ys.tolist())
+        return surface.blits(zip(repeat(self.image), positions))
@@ -0,0 +1,61 @@
+import logging
+from time import perf_counter
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+class GameClock:
+    """
+    A class to step the simulation at a fixed rate and cap drawing.
+
+    Game speeds are measured per tick, so running a fixed number of ticks
+      per second plays the same on every machine, however fast it draws.
+    """
+
+    def __init__(self, settings, max_fps=None):
+        """
+        Initialize the clock from the game's settings.
+
+        max_fps caps how often ticks_due() returns in place of
+          settings.max_fps.
+        """
+        self.settings = settings
+        self.max_fps = max_fps or settings.max_fps
+        self.tick_length = 1 / settings.tick_rate
+        self.frame_clock = pygame.time.Clock()
+
+        # Time that has passed but hasn't been simulated yet.
+        self.lag = 0.0
+        self.last_time = perf_counter()
+
+        # How far drawing is between the last tick and the next one.
+        self.alpha = 0.0
+
+        # Ticks skipped because the game fell too far behind.
+        self.dropped_ticks = 0
+
+    def ticks_due(self):
+        """
+        Wait for the next frame, and return how many ticks to run first.
+
+        If the game falls further behind than settings.max_ticks_per_frame
+          the extra ticks are dropped, so one slow frame can't snowball.
+        """
+        self.frame_clock.tick(self.max_fps)
+        now = perf_counter()
+        self.lag += now - self.last_time
+        self.last_time = now
+
+        ticks = int(self.lag / self.tick_length)
+        if ticks > self.settings.max_ticks_per_frame:
+            dropped = ticks - self.settings.max_ticks_per_frame
+            self.dropped_ticks += dropped
+            logger.warning("Fell behind; dropped %d ticks (%d in total).",
+                    dropped, self.dropped_ticks)
+            ticks = self.settings.max_ticks_per_frame
+            self.lag = ticks * self.tick_length
+
+        self.lag -= ticks * self.tick_length
+        self.alpha = self.lag / self.tick_length
+        return ticks
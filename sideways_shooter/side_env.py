@@ -0,0 +1,180 @@
+"""
+Play Side Attack as a reinforcement learning environment.
+
+SideAttackEnv wraps one headless game behind reset() and step(action),
+  and VecSideAttackEnv steps several games in lockstep and returns their
+  observations batched into single arrays. Neither opens a window, so
+  any number of them can run in one process.
+
+    env = VecSideAttackEnv(16)
+    obs = env.reset(seed=0)
+    obs, rewards, dones, infos = env.step(np.full(16, FIRE))
+"""
+import copy
+import os
+
+# Never open a window, even where there is a display.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+
+from side_settings import Settings
+from side_attack import SideAttack
+
+# The actions an agent can take, and the inputs each one holds down.
+NOOP = 0
+UP = 1
+DOWN = 2
+FIRE = 3
+ACTIONS = ((), ('up',), ('down',), ('fire',))
+
+def _observation_space(game):
+    """Return the shape and type of each observation array for a game."""
+    return {
+        'ship_y': ((), np.float32),
+        'bullets': ((len(game.bullets.active), 2), np.float32),
+        'bullet_active': ((len(game.bullets.active),), bool),
+        'aliens': ((len(game.aliens.x), 2), np.float32),
+        'alien_alive': ((len(game.aliens.x),), bool),
+        'fleet_direction': ((), np.int8),
+    }
+
+class SideAttackEnv:
+    """
+    A headless game of Side Attack with a reset/step interface.
+
+    Every step holds one action down for frame_skip ticks and returns
+      the new observation, the points scored, whether the game is over,
+      and an info dict. Observations are a dict of NumPy arrays: the
+      ship's y, each bullet slot's position and whether it's in use,
+      each alien's position and whether it's alive, and the direction
+      the fleet is moving.
+    """
+
+    def __init__(self, difficulty=2, frame_skip=4, max_ticks=None,
+            settings=None, buffers=None):
+        """
+        Create the game behind the environment.
+
+        max_ticks ends an episode that runs too long. The observation is
+          written into buffers, a dict of arrays shaped like
+          observation_space, when they are given.
+        """
+        self.difficulty = difficulty
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.game = SideAttack(headless=True, settings=settings or Settings())
+
+        # A fleet's size only depends on the screen, so start a game to
+        #   find out how big the observation arrays need to be.
+        self.game.start_game(difficulty)
+        self.start_tick = self.game.ticks
+        self.observation_space = _observation_space(self.game)
+        if buffers is None:
+            buffers = {name: np.zeros(shape, dtype)
+                    for name, (shape, dtype) in self.observation_space.items()}
+        self.obs = buffers
+
+    def reset(self, seed=None):
+        """Start a new game, and return the first observation."""
+        # The game itself is deterministic; seed is accepted so agents
+        #   can treat this like any other environment.
+        self.game.start_game(self.difficulty)
+        self.start_tick = self.game.ticks
+        self._observe()
+        return self.obs
+
+    def step(self, action):
+        """Hold an action for frame_skip ticks, and report what happened."""
+        game = self.game
+        score = game.stats.score
+        game.step(self.frame_skip, ACTIONS[action])
+        self._observe()
+
+        reward = game.stats.score - score
+        done = not game.stats.game_active
+        truncated = (not done and self.max_ticks is not None
+                and game.ticks - self.start_tick >= self.max_ticks)
+        info = {'level': game.stats.level, 'ships_left': game.stats.ships_left,
+                'ticks': game.ticks - self.start_tick,
+                'truncated': truncated}
+        return self.obs, reward, done or truncated, info
+
+    def _observe(self):
+        """Copy the game's state into the observation arrays."""
+        game, obs = self.game, self.obs
+        obs['ship_y'][...] = game.ship.y
+        obs['fleet_direction'][...] = game.settings.fleet_direction
+
+        bullets = game.bullets
+        active = bullets.active[:len(obs['bullet_active'])]
+        obs['bullet_active'][:] = active
+        obs['bullets'][:, 0] = bullets.x[:len(active)]
+        obs['bullets'][:, 1] = bullets.y[:len(active)]
+        obs['bullets'][~active] = 0
+
+        aliens = game.aliens
+        alive = aliens.alive[:len(obs['alien_alive'])]
+        obs['alien_alive'][:len(alive)] = alive
+        obs['alien_alive'][len(alive):] = False
+        obs['aliens'][:len(alive), 0] = aliens.x[:len(alive)]
+        obs['aliens'][:len(alive), 1] = aliens.y[:len(alive)]
+        obs['aliens'][~obs['alien_alive']] = 0
+
+class VecSideAttackEnv:
+    """
+    Several games of Side Attack stepped in lockstep.
+
+    Each game writes its observation straight into its own row of
+      shared arrays, so a step returns one array per observation with a
+      leading axis for the games, without copying or stacking anything.
+      A game that ends is reset straight away, and its final observation
+      is kept in its info dict.
+    """
+
+    def __init__(self, num_envs, difficulty=2, frame_skip=4, max_ticks=None,
+            settings=None):
+        """Create num_envs games, each with its own copy of settings."""
+        first = SideAttackEnv(difficulty, frame_skip, max_ticks,
+                self._settings(settings))
+        self.num_envs = num_envs
+        self.observation_space = first.observation_space
+        self.obs = {name: np.zeros((num_envs,) + shape, dtype)
+                for name, (shape, dtype) in self.observation_space.items()}
+
+        first.obs = self._row(0)
+        self.envs = [first] + [
+                SideAttackEnv(difficulty, frame_skip, max_ticks,
+                    self._settings(settings), self._row(number))
+                for number in range(1, num_envs)]
+
+        self.rewards = np.zeros(num_envs, dtype=np.int64)
+        self.dones = np.zeros(num_envs, dtype=bool)
+
+    def _settings(self, settings):
+        """Return settings of its own for a new game."""
+        return copy.copy(settings) if settings else Settings()
+
+    def _row(self, number):
+        """Return views of one game's row of the observation arrays."""
+        return {name: array[number, ...] for name, array in self.obs.items()}
+
+    def reset(self, seed=None):
+        """Start a new game in every environment."""
+        for number, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + number)
+        return self.obs
+
+    def step(self, actions):
+        """Step every game with its own action, resetting any that end."""
+        infos = []
+        for number, (env, action) in enumerate(zip(self.envs, actions)):
+            _, self.rewards[number], self.dones[number], info = env.step(
+                    action)
+            if self.dones[number]:
+                info['final_observation'] = {name: array.copy()
+                        for name, array in env.obs.items()}
+                env.reset()
+            infos.append(info)
+        return self.obs, self.rewards, self.dones, infos
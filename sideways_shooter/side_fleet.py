@@ -0,0 +1,272 @@
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from itertools import repeat
+
+import numpy as np
+
+from side_assets import assets
+
+def rect_round(values):
+    """Round positions to whole pixels the way pygame.Rect does."""
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+def _rect_round(value):
+    """Round a single position the way pygame.Rect does."""
+    if value < 0:
+        return -int(0.5 - value)
+    return int(value + 0.5)
+
+def _bin_columns(xs, ys):
+    """
+    Sort aliens into columns, top to bottom within each column.
+
+    Returns the left edge of each column, from left to right, and the
+      indices of the aliens in each one.
+    """
+    columns, column_of = np.unique(xs, return_inverse=True)
+    order = np.lexsort((np.arange(len(xs)), ys, column_of))
+    starts = np.searchsorted(column_of[order], np.arange(len(columns)))
+    return columns.tolist(), np.split(order, starts[1:])
+
+FleetLayout = namedtuple('FleetLayout', 'xs ys column_x columns')
+
+@lru_cache(maxsize=16)
+def fleet_layout(screen_width, screen_height, alien_width, alien_height,
+        ship_width):
+    """
+    Return where every alien in a new fleet goes, worked out only once.
+
+    Aliens fill columns from the right of the screen, leaving room for
+      the ship on the left, with a gap of one alien between neighbours.
+      The arrays are shared by every fleet spawned from the layout, so
+      they are read-only.
+    """
+    number_aliens_y = (screen_height - 2 * alien_height) // (2 * alien_height)
+    number_columns = ((screen_width - 8 * alien_width - ship_width) //
+            (2 * alien_width))
+
+    # Place every alien at once, one column after another.
+    column_numbers, alien_numbers = np.meshgrid(np.arange(number_columns),
+            np.arange(number_aliens_y), indexing='ij')
+    xs = (screen_width - (alien_width + 2 * alien_width *
+            column_numbers.ravel()) - 4 * alien_width)
+    ys = (alien_height + 2 * alien_height * alien_numbers.ravel()).astype(
+            np.float64)
+
+    column_x, columns = _bin_columns(xs, ys)
+    for array in [xs, ys] + columns:
+        array.flags.writeable = False
+    return FleetLayout(xs, ys, column_x, tuple(columns))
+
+class Fleet:
+    """
+    A class to manage the alien fleet as arrays instead of sprites.
+
+    Every alien shares one image, so the fleet only keeps each alien's
+      position and whether it is still alive. The whole fleet always
+      moves together, so the aliens at its edges stay at its edges until
+      one of them is destroyed, and aliens that share a column keep
+      sharing it. Collisions use those columns as a broadphase: a rect
+      is only tested against the aliens in the columns it overlaps.
+    """
+
+    def __init__(self, ss_game):
+        """Initialize an empty fleet."""
+        self.screen = ss_game.screen
+        self.settings = ss_game.settings
+
+        # Every alien is drawn with the same shared image.
+        self.image = assets.image('alien.bmp')
+        self.width, self.height = self.image.get_size()
+
+        self.empty()
+
+    def empty(self):
+        """Remove every alien from the fleet."""
+        self.spawn([], [])
+
+    def spawn(self, xs, ys):
+        """Replace the fleet with new aliens at the given positions."""
+        # Horizontal positions only ever move by whole pixels, but
+        #   the exact vertical positions are kept as decimal values.
+        self.x = np.array(xs, dtype=np.int64)
+        self.y = np.array(ys, dtype=np.float64)
+        self.prev_y = self.y.copy()
+        self.alive = np.ones(len(self.x), dtype=bool)
+        self.count = len(self.x)
+        self._find_edges()
+        self._column_x, self._columns = _bin_columns(self.x, self.y)
+
+    def spawn_layout(self, layout):
+        """Replace the fleet with a new one placed by a fleet_layout()."""
+        self.x = layout.xs.astype(np.int64)
+        self.y = layout.ys.copy()
+        self.prev_y = layout.ys.copy()
+        self.alive = np.ones(len(self.x), dtype=bool)
+        self.count = len(self.x)
+        self._find_edges()
+
+        # Columns are replaced as aliens die, so take copies of the lists.
+        self._column_x = list(layout.column_x)
+        self._columns = list(layout.columns)
+
+    def __len__(self):
+        """Return the number of aliens still alive."""
+        return self.count
+
+    def _find_edges(self):
+        """Remember which living aliens are at the edges of the fleet."""
+        if not self.count:
+            self._top = self._bottom = self._left = self._right = None
+            return
+
+        living = np.flatnonzero(self.alive)
+        self._top = living[np.argmin(self.y[living])]
+        self._bottom = living[np.argmax(self.y[living])]
+        self._left = living[np.argmin(self.x[living])]
+        self._right = living[np.argmax(self.x[living])]
+
+    def _remove_from_columns(self, hits):
+        """Take destroyed aliens out of the columns they were in."""
+        for number in set(np.searchsorted(
+                self._column_x, self.x[hits]).tolist()):
+            column = self._columns[number]
+            self._columns[number] = column[self.alive[column]]
+
+    def rect_ys(self):
+        """Return the whole-pixel vertical position of every alien."""
+        return rect_round(self.y)
+
+    def update(self):
+        """Move the whole fleet up or down."""
+        self.prev_y[:] = self.y
+        self.y += self.settings.alien_speed * self.settings.fleet_direction
+
+    def check_edges(self):
+        """Return True if any alien is at the top or bottom of the screen."""
+        if not self.count:
+            return False
+
+        screen_rect = self.screen.get_rect()
+        top = _rect_round(self.y[self._top])
+        bottom = _rect_round(self.y[self._bottom]) + self.height
+        return bottom >= screen_rect.bottom or top <= screen_rect.top
+
+    def drop(self, distance):
+        """Move the whole fleet towards the left of the screen."""
+        self.x -= distance
+        self._column_x = [x - distance for x in self._column_x]
+
+    def reached_left(self, left):
+        """Return True if any alien has reached the given left edge."""
+        return bool(self.count) and self.x[self._left] <= left
+
+    def _near(self, left, top, right, bottom):
+        """Return True if a box overlaps the box around the living aliens."""
+        if not self.count:
+            return False
+        return (self.x[self._left] < right and
+                self.x[self._right] + self.width > left and
+                _rect_round(self.y[self._top]) < bottom and
+                _rect_round(self.y[self._bottom]) + self.height > top)
+
+    def _overlapping(self, left, top, right, bottom):
+        """Return the indices of the living aliens that overlap a box."""
+        if not self._near(left, top, right, bottom):
+            return []
+
+        # Only the columns that overlap the box can hold a collision.
+        first = bisect_right(self._column_x, left - self.width)
+        last = bisect_left(self._column_x, right)
+
+        hits = []
+        for column in self._columns[first:last]:
+            if not column.size:
+                continue
+            rect_ys = rect_round(self.y[column])
+            first_row = rect_ys.searchsorted(top - self.height, 'right')
+            last_row = rect_ys.searchsorted(bottom, 'left')
+            if first_row < last_row:
+                hits.extend(column[first_row:last_row].tolist())
+
+        # Report aliens in the order they were spawned, like a Group.
+        hits.sort()
+        return hits
+
+    def collide_rect(self, rect):
+        """Return True if any living alien overlaps rect."""
+        return bool(self._overlapping(rect.left, rect.top, rect.right,
+                rect.bottom))
+
+    def collide_bullets(self, bullets):
+        """
+        Kill the bullets and aliens that have collided.
+
+        Works like pygame.sprite.groupcollide(bullets, aliens, True, True):
+          returns a dict mapping the slot of each bullet that hit something
+          to the indices of the aliens it destroyed.
+        """
+        collisions = {}
+        if not self.count or not bullets.count:
+            return collisions
+
+        for slot in bullets.slots():
+            left, top = int(bullets.left[slot]), int(bullets.y[slot])
+            hits = self._overlapping(left, top, left + bullets.width,
+                    top + bullets.height)
+            if hits:
+                self.alive[hits] = False
+                self.count -= len(hits)
+                self._remove_from_columns(hits)
+                self._find_edges()
+                collisions[slot] = hits
+                bullets.kill(slot)
+
+        return collisions
+
+    def snapshot(self):
+        """
+        Return read-only copies of the positions of the living aliens.
+
+        Aliens are listed as left edges, vertical positions, and vertical
+          positions on the last tick.
+        """
+        alive = self.alive
+        arrays = (self.x[alive], self.y[alive], self.prev_y[alive])
+        for array in arrays:
+            array.flags.writeable = False
+        return arrays
+
+    def state(self):
+        """Return copies of the fleet's arrays, for restore() to put back."""
+        return (self.x.copy(), self.y.copy(), self.prev_y.copy(),
+                self.alive.copy())
+
+    def restore(self, state):
+        """Put the fleet back the way state() found it."""
+        x, y, prev_y, alive = state
+        self.x, self.y, self.prev_y = x.copy(), y.copy(), prev_y.copy()
+        self.alive = alive.copy()
+        self.count = int(alive.sum())
+        self._find_edges()
+
+        # Columns only ever lose aliens, so binning every alien again and
+        #   leaving out the dead ones gives the same columns as before.
+        self._column_x, columns = _bin_columns(self.x, self.y)
+        self._columns = [column[alive[column]] for column in columns]
+
+    def draw(self, surface, alpha=1.0, snapshot=None):
+        """
+        Draw every living alien in a single batch.
+
+        Aliens are drawn alpha of the way from their last tick to this one.
+          Drops aren't smoothed; the fleet jumps left as it always has.
+          Draws the aliens in snapshot instead of the fleet's own if one
+          is given. Returns the rects that were drawn.
+        """
+        xs, ys, prev_ys = snapshot or self.snapshot()
+        if alpha != 1.0:
+            ys = prev_ys + (ys - prev_ys) * alpha
+        positions = zip(xs.tolist(), rect_round(ys).tolist())
+        return surface.blits(zip(repeat(self.image), positions))
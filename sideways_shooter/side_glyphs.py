@@ -0,0 +1,44 @@
+import pygame
+
+class GlyphAtlas:
+    """
+    A class to draw numbers from characters that are rendered only once.
+
+    Rendering text with a font is slow, and the scoreboard only ever
+      shows digits and commas, so those are rendered up front and numbers
+      are pieced together from them. Piecing numbers together never
+      touches the font, so it's safe on a simulation thread while the
+      main thread renders text of its own.
+    """
+
+    def __init__(self, font, text_color, bg_color, chars='0123456789,'):
+        """Initialize an atlas with chars already rendered."""
+        self.font = font
+        self.text_color = text_color
+        self.bg_color = bg_color
+        self.height = font.get_height()
+        self.glyphs = {}
+        for char in chars:
+            self._glyph(char)
+
+    def _glyph(self, char):
+        """Return the rendered image of a single character."""
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            glyph = self.font.render(char, True, self.text_color,
+                    self.bg_color)
+            self.glyphs[char] = glyph
+        return glyph
+
+    def render(self, text):
+        """Return an image of text, pieced together from cached glyphs."""
+        glyphs = [self._glyph(char) for char in text]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        image = pygame.Surface((width, self.height))
+        image.fill(self.bg_color)
+
+        x = 0
+        for glyph in glyphs:
+            image.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        return image
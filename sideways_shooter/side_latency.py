@@ -0,0 +1,131 @@
+import atexit
+import csv
+import threading
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+# The keys whose latency is measured, and that are read at every tick
+#   when the keyboard is sampled instead of read from events.
+TIMED_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE)
+
+class InputLatency:
+    """
+    A class to measure how long input takes to reach the screen.
+
+    Each key press or release is timed from when the game reads it, to
+      the end of the first tick that acts on it, and on to the end of the
+      first frame drawn after that tick. pygame doesn't say when a key was
+      really pressed, so the time since the keyboard was last read is
+      kept too, as the longest the input could have waited unseen.
+    """
+
+    columns = ('unseen_ms', 'state_ms', 'display_ms')
+
+    def __init__(self, settings):
+        """Initialize an empty history of measurements."""
+        self.settings = settings
+        self.enabled = settings.track_latency or bool(settings.latency_csv)
+        self.inputs = np.zeros((settings.latency_history, 3))
+        self.input_count = 0
+
+        # When the keyboard was last read, and the one time before that.
+        self.last_read = self.previous_read = perf_counter()
+
+        # Input no tick has acted on yet, and input no frame has shown.
+        #   Ticks and frames can happen on different threads.
+        self.seen = []
+        self.applied = []
+        self.lock = threading.Lock()
+
+        if settings.track_latency:
+            atexit.register(self.report)
+        if settings.latency_csv:
+            atexit.register(self.export_csv, settings.latency_csv)
+
+    def read_input(self):
+        """Note that the game is reading the keyboard."""
+        if self.enabled:
+            self.previous_read = self.last_read
+            self.last_read = perf_counter()
+
+    def input_seen(self):
+        """Start timing an input found by the latest read."""
+        if self.enabled:
+            self.seen.append((self.last_read - self.previous_read,
+                    self.last_read))
+
+    def tick_done(self):
+        """Note that a tick has acted on every input seen so far."""
+        if self.seen:
+            now = perf_counter()
+            with self.lock:
+                self.applied += [(unseen, now - seen, seen)
+                        for unseen, seen in self.seen]
+                self.seen = []
+
+    def discard_seen(self):
+        """
+        Stop timing every input seen so far.
+
+        A tick that doesn't move the game, in the menu, while paused, or
+          while a new ship arrives, can't act on input, and timing it
+          until play resumes would count the wait as latency.
+        """
+        if self.seen:
+            with self.lock:
+                self.seen = []
+
+    def frame_shown(self):
+        """Store every input the frame just drawn has shown."""
+        if not self.applied:
+            return
+
+        now = perf_counter()
+        with self.lock:
+            applied, self.applied = self.applied, []
+        for unseen, state, seen in applied:
+            self.inputs[self.input_count % len(self.inputs)] = (
+                    unseen, state, now - seen)
+            self.input_count += 1
+
+    def history(self):
+        """Return the stored measurements from oldest to newest."""
+        size = len(self.inputs)
+        if self.input_count <= size:
+            return self.inputs[:self.input_count]
+        start = self.input_count % size
+        return np.concatenate((self.inputs[start:], self.inputs[:start]))
+
+    def summary(self):
+        """Return the median, p95 and worst of each measurement, in ms."""
+        inputs = self.history() * 1000
+        if not len(inputs):
+            return {}
+        return {name: {'p50': float(np.percentile(inputs[:, i], 50)),
+                    'p95': float(np.percentile(inputs[:, i], 95)),
+                    'max': float(inputs[:, i].max())}
+                for i, name in enumerate(self.columns)}
+
+    def report(self):
+        """Print the summary of every stored measurement."""
+        summary = self.summary()
+        if not summary:
+            return
+
+        print(f"Input latency over the last {len(self.history())} inputs:")
+        for name, values in summary.items():
+            print(f"  {name[:-3]:<8} p50 {values['p50']:7.2f} ms  "
+                    f"p95 {values['p95']:7.2f} ms  "
+                    f"max {values['max']:7.2f} ms")
+
+    def export_csv(self, path):
+        """Write every stored measurement to a CSV file, in milliseconds."""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['input'] + list(self.columns))
+
+            first = max(0, self.input_count - len(self.inputs))
+            for number, row in enumerate(self.history(), first):
+                writer.writerow([number] + [f"{t * 1000:.4f}" for t in row])
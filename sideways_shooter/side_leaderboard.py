@@ -0,0 +1,225 @@
+"""
+Keep every finished game of Side Attack in a local SQLite database.
+
+Games are written by a background thread in batches, so recording one
+  never stalls the game, and indexes on score keep the top scores, over
+  all games or for one difficulty, quick to find however many games
+  have been played.
+
+    python side_leaderboard.py --top 20 --difficulty 3
+"""
+import argparse
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import namedtuple
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+# One finished game. duration is in seconds of play, and finished_at is
+#   a Unix timestamp. completed is False if the player quit mid-game.
+#   A difficulty of 0 marks the record imported from the old score file.
+Game = namedtuple('Game', 'finished_at difficulty level score duration '
+        'completed')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    difficulty INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    completed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC);
+CREATE INDEX IF NOT EXISTS games_by_difficulty
+    ON games (difficulty, score DESC);
+"""
+
+class Leaderboard:
+    """
+    A class to record finished games and look up the best ones.
+
+    Recorded games wait in memory until the background writer picks them
+      up, and everything waiting is written in one transaction. Lookups
+      read the database directly, so they see every game written so far.
+    """
+
+    def __init__(self, path):
+        """Open or create the database, and start the background writer."""
+        self.path = path
+
+        # The seconds spent reading and writing the database so far.
+        #   Opening it counts as reading.
+        started = perf_counter()
+        self.reader = self._connect()
+        self.reader.executescript(SCHEMA)
+        self.read_time = perf_counter() - started
+        self.write_time = 0.0
+
+        # The games waiting to be written, and whether a batch is being
+        #   written now.
+        self.pending = []
+        self.writing = False
+        self.changed = threading.Condition()
+
+        # Nothing is written until a game ends, so the writer isn't
+        #   started until then either. Flushing at exit is registered
+        #   now, though, so it runs after anything registered later,
+        #   such as stopping the simulation thread that records games.
+        self.writer = None
+        atexit.register(self.flush)
+
+    def _connect(self):
+        """Open a connection for the thread that calls this."""
+        connection = sqlite3.connect(self.path)
+        # Let lookups carry on while the writer adds games.
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def import_high_score(self, path):
+        """
+        Keep the record from the score file older versions used.
+
+        The score is added once, as a game at difficulty 0, so upgrading
+          doesn't lose the all time high score.
+        """
+        started = perf_counter()
+        imported = self.reader.execute(
+                "SELECT 1 FROM games WHERE difficulty = 0 LIMIT 1").fetchone()
+        if imported or not os.path.exists(path):
+            self.read_time += perf_counter() - started
+            return
+
+        try:
+            with open(path) as f:
+                score = int(json.load(f))
+        except (OSError, ValueError, TypeError):
+            logger.warning("Ignoring unreadable high score file %s.", path)
+            return
+
+        game = Game(os.path.getmtime(path), 0, 0, score, 0.0, True)
+        with self.reader:
+            self.reader.execute(
+                "INSERT INTO games (" + ", ".join(Game._fields) +
+                    ") VALUES (?, ?, ?, ?, ?, ?)", game)
+        self.write_time += perf_counter() - started
+
+    def record(self, difficulty, level, score, duration, completed=True):
+        """Record a finished game, and write it out later."""
+        game = Game(time.time(), difficulty, level, score, duration,
+                completed)
+        if self.writer is None:
+            self.writer = threading.Thread(target=self._write_behind,
+                    daemon=True)
+            self.writer.start()
+
+        with self.changed:
+            self.pending.append(game)
+            self.changed.notify_all()
+
+    def flush(self):
+        """Wait until every recorded game has been written."""
+        with self.changed:
+            while self.pending or self.writing:
+                self.changed.wait()
+
+    def top(self, n=10, difficulty=None):
+        """Return the n best games, over all games or at one difficulty."""
+        started = perf_counter()
+        query = "SELECT " + ", ".join(Game._fields) + " FROM games"
+        if difficulty is None:
+            rows = self.reader.execute(
+                query + " ORDER BY score DESC LIMIT ?", (n,))
+        else:
+            rows = self.reader.execute(
+                query + " WHERE difficulty = ? ORDER BY score DESC LIMIT ?",
+                (difficulty, n))
+        games = [Game(*row[:-1], bool(row[-1])) for row in rows]
+        self.read_time += perf_counter() - started
+        return games
+
+    def best_score(self, difficulty=None):
+        """Return the best score recorded, or 0 if there isn't one."""
+        best = self.top(1, difficulty)
+        return best[0].score if best else 0
+
+    def count(self, difficulty=None):
+        """Return how many games have been recorded."""
+        started = perf_counter()
+        if difficulty is None:
+            row = self.reader.execute("SELECT COUNT(*) FROM games")
+        else:
+            row = self.reader.execute(
+                "SELECT COUNT(*) FROM games WHERE difficulty = ?",
+                (difficulty,))
+        count = row.fetchone()[0]
+        self.read_time += perf_counter() - started
+        return count
+
+    def _write_behind(self):
+        """Write recorded games in batches as they come in."""
+        connection = None
+        while True:
+            with self.changed:
+                while not self.pending:
+                    self.changed.wait()
+                games = self.pending
+                self.pending = []
+                self.writing = True
+
+            started = perf_counter()
+            try:
+                # Connect with the first batch, and try again with the
+                #   next one if that fails.
+                if connection is None:
+                    connection = self._connect()
+                with connection:
+                    connection.executemany(
+                        "INSERT INTO games (" + ", ".join(Game._fields) +
+                            ") VALUES (?, ?, ?, ?, ?, ?)", games)
+            except sqlite3.Error as e:
+                logger.warning("Couldn't record %d games: %s", len(games), e)
+            self.write_time += perf_counter() - started
+
+            with self.changed:
+                self.writing = False
+                self.changed.notify_all()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--top', type=int, default=10,
+            help="how many games to list")
+    parser.add_argument('--difficulty', type=int,
+            help="only list games at this difficulty")
+    parser.add_argument('--database', help="the database to read "
+            "(default: the game's own)")
+    args = parser.parse_args()
+
+    if args.database is None:
+        from side_settings import Settings
+        args.database = Settings().leaderboard_file
+
+    if not os.path.exists(args.database):
+        sys.exit(f"No leaderboard at {args.database}.")
+
+    leaderboard = Leaderboard(args.database)
+    print(f"{leaderboard.count(args.difficulty):,} games recorded.")
+    for rank, game in enumerate(leaderboard.top(args.top, args.difficulty), 1):
+        finished = time.strftime('%Y-%m-%d %H:%M',
+                time.localtime(game.finished_at))
+        print(f"{rank:>3}. {game.score:>10,}  level {game.level:>3}  "
+                f"difficulty {game.difficulty}  {game.duration:7.1f} s  "
+                f"{finished}{'' if game.completed else '  (quit)'}"
+                f"{'  (imported)' if not game.difficulty else ''}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+Export a running game's metrics to a local collector.
+
+Each frame only stores how long it took. Every few seconds the frames
+  since the last export are summed up, along with the game's entity
+  counts, level, score and leaderboard I/O time, and handed to a
+  background thread that sends them on. A slow or missing collector
+  never holds a frame up.
+
+Metrics whose names end in _total count up over the whole run; every
+  other metric is a gauge of its value at export time.
+"""
+import logging
+import os
+import socket
+import tempfile
+import threading
+from time import perf_counter
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class StatsdExporter:
+    """A class to send metrics to a statsd server in one UDP packet."""
+
+    def __init__(self, settings):
+        """Prepare to send to the address in settings.metrics_statsd."""
+        self.address = settings.metrics_statsd
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        # The totals sent so far, since statsd counters take increases.
+        self.sent_totals = {}
+
+    def export(self, prefix, metrics):
+        """Send every metric, totals as counters and the rest as gauges."""
+        lines = []
+        for name, value in metrics.items():
+            if name.endswith('_total'):
+                increase = round(value - self.sent_totals.get(name, 0), 6)
+                self.sent_totals[name] = value
+                lines.append(f"{prefix}.{name[:-6]}:{increase}|c")
+            else:
+                lines.append(f"{prefix}.{name}:{value}|g")
+        self.socket.sendto('\n'.join(lines).encode(), self.address)
+
+class TextfileExporter:
+    """A class to write metrics to a file in Prometheus's text format."""
+
+    def __init__(self, settings):
+        """Prepare to write to settings.metrics_textfile."""
+        self.path = settings.metrics_textfile
+
+    def export(self, prefix, metrics):
+        """
+        Replace the metrics file in one step.
+
+        The metrics go to a temporary file next to the real one, which is
+          then renamed over it, so a collector never reads a half-written
+          file.
+        """
+        lines = []
+        for name, value in metrics.items():
+            kind = 'counter' if name.endswith('_total') else 'gauge'
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.append(f"{prefix}_{name} {value}")
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write('\n'.join(lines) + '\n')
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+# The exporters settings.metrics_exporter can name.
+EXPORTERS = {
+    'statsd': StatsdExporter,
+    'textfile': TextfileExporter,
+}
+
+class GameMetrics:
+    """
+    A class to gather a game's metrics and export them now and then.
+
+    settings.metrics_exporter names one of EXPORTERS, or is any object
+      with an export(prefix, metrics) method. With no exporter, nothing
+      is gathered.
+    """
+
+    def __init__(self, settings, prefix, stats, leaderboard=None):
+        """Prepare to export the metrics of the game stats belong to."""
+        exporter = settings.metrics_exporter
+        if isinstance(exporter, str):
+            exporter = EXPORTERS[exporter](settings)
+        self.exporter = exporter
+        self.enabled = exporter is not None
+        self.prefix = prefix
+        self.stats = stats
+        self.leaderboard = leaderboard
+        self.interval = settings.metrics_interval
+
+        # The length of each frame since the last export. If frames come
+        #   faster than expected, only the latest are kept.
+        self.frame_times = np.zeros(
+                max(1, int(settings.max_fps * settings.metrics_interval * 2)))
+        self.frame_count = 0
+        self.last_frame = self.last_export = None
+
+        # The latest metrics not yet handed to the exporter.
+        self.pending = None
+        self.changed = threading.Condition()
+
+        if self.enabled:
+            exporting = threading.Thread(target=self._export_behind,
+                    daemon=True)
+            exporting.start()
+
+    def frame_done(self, **counts):
+        """Store the frame just drawn, and export if it's time to."""
+        if not self.enabled:
+            return
+
+        now = perf_counter()
+        if self.last_frame is None:
+            # Time from the first frame on, not from starting up.
+            self.last_frame = self.last_export = now
+            return
+
+        self.frame_times[self.frame_count % len(self.frame_times)] = (
+                now - self.last_frame)
+        self.frame_count += 1
+        self.last_frame = now
+
+        if now - self.last_export >= self.interval:
+            self._gather(now, counts)
+
+    def _gather(self, now, counts):
+        """Sum up the frames since the last export, and queue the batch."""
+        times = self.frame_times[:self.frame_count] * 1000
+        p50, p95, p99 = np.percentile(times, (50, 95, 99))
+        metrics = {
+            'fps': round(self.frame_count / (now - self.last_export), 2),
+            'frame_ms_p50': round(float(p50), 3),
+            'frame_ms_p95': round(float(p95), 3),
+            'frame_ms_p99': round(float(p99), 3),
+            'frame_ms_max': round(float(times.max()), 3),
+        }
+        metrics.update(counts)
+        metrics['level'] = self.stats.level
+        metrics['score'] = int(self.stats.score)
+        if self.leaderboard:
+            metrics['leaderboard_read_seconds_total'] = round(
+                    self.leaderboard.read_time, 6)
+            metrics['leaderboard_write_seconds_total'] = round(
+                    self.leaderboard.write_time, 6)
+
+        self.frame_count = 0
+        self.last_export = now
+        with self.changed:
+            self.pending = metrics
+            self.changed.notify_all()
+
+    def _export_behind(self):
+        """Export metrics as they are gathered, skipping any replaced."""
+        while True:
+            with self.changed:
+                while self.pending is None:
+                    self.changed.wait()
+                metrics = self.pending
+                self.pending = None
+
+            try:
+                self.exporter.export(self.prefix, metrics)
+            except OSError as e:
+                logger.warning("Couldn't export metrics: %s", e)
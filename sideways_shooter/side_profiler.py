@@ -0,0 +1,148 @@
+import atexit
+import csv
+import threading
+from time import perf_counter
+
+import numpy as np
+
+from side_assets import assets
+
+class FrameProfiler:
+    """
+    A class to time each phase of every frame.
+
+    The game marks the end of each phase as it goes, and the time since
+      the previous mark is charged to that phase. The last few thousand
+      frames are kept in a ring buffer, which can be shown as an overlay
+      and written out as a CSV file when the game exits.
+    """
+
+    def __init__(self, settings, phases, counters):
+        """Initialize an empty profile with the given columns."""
+        self.settings = settings
+        self.phases = phases
+        self.counters = counters
+        self.enabled = settings.profile_frames
+        self.show_overlay = False
+
+        # Each row holds a frame's phase times in seconds, then the
+        #   entity counts at the end of that frame.
+        width = len(phases) + len(counters)
+        self.phase_columns = {name: i for i, name in enumerate(phases)}
+        self.counter_columns = {name: i for i, name in
+                enumerate(counters, len(phases))}
+        self.frames = np.zeros((settings.profile_history, width))
+        self.row = np.zeros(width)
+        self.frame_count = 0
+        self.last_mark = perf_counter()
+        self.thread = threading.get_ident()
+
+        # Overlay text is only re-rendered a few times a second.
+        self.font = None
+        self.overlay_images = []
+        self.version = 0
+
+        if settings.profile_csv:
+            self.enabled = True
+            atexit.register(self.export_csv, settings.profile_csv)
+
+    def toggle_overlay(self):
+        """Show or hide the overlay, profiling while it is shown."""
+        self.show_overlay = not self.show_overlay
+        was_enabled = self.enabled
+        self.enabled = self.show_overlay or self.settings.profile_frames
+        self.version += 1
+
+        # Time the rest of this frame from now, instead of charging it
+        #   with everything since profiling was last on.
+        if self.enabled and not was_enabled:
+            self.row[:] = 0
+            self.last_mark = perf_counter()
+
+    def start_frame(self):
+        """Start timing a new frame on the thread that draws it."""
+        self.thread = threading.get_ident()
+        if self.enabled:
+            self.row[:] = 0
+            self.last_mark = perf_counter()
+
+    def mark(self, phase):
+        """
+        Charge the time since the last mark to phase.
+
+        Marks from any thread but the one timing frames are ignored, so a
+          simulation thread doesn't mix its time into the frame's.
+        """
+        if self.enabled and threading.get_ident() == self.thread:
+            now = perf_counter()
+            self.row[self.phase_columns[phase]] += now - self.last_mark
+            self.last_mark = now
+
+    def end_frame(self, **counts):
+        """Store the frame that just finished, with its entity counts."""
+        if not self.enabled:
+            return
+
+        for name, value in counts.items():
+            self.row[self.counter_columns[name]] = value
+        self.frames[self.frame_count % len(self.frames)] = self.row
+        self.frame_count += 1
+
+        if self.show_overlay and not self.frame_count % 15:
+            self._prep_overlay()
+
+    def history(self):
+        """Return the stored frames from oldest to newest."""
+        size = len(self.frames)
+        if self.frame_count <= size:
+            return self.frames[:self.frame_count]
+        start = self.frame_count % size
+        return np.concatenate((self.frames[start:], self.frames[:start]))
+
+    def _prep_overlay(self):
+        """Turn the rolling averages and p99 times into rendered images."""
+        if self.font is None:
+            self.font = assets.font(24)
+
+        frames = self.history()
+        times = frames[:, :len(self.phases)] * 1000
+        totals = times.sum(axis=1)
+        rows = [('phase', 'avg ms', 'p99 ms')]
+        for i, phase in enumerate(self.phases):
+            rows.append((phase, f"{times[:, i].mean():.3f}",
+                    f"{np.percentile(times[:, i], 99):.3f}"))
+        rows.append(('frame', f"{totals.mean():.3f}",
+                f"{np.percentile(totals, 99):.3f}"))
+        for name in self.counters:
+            rows.append((name, str(int(frames[-1, self.counter_columns[name]])),
+                    ''))
+
+        # Line the cells up in columns, since the font isn't monospaced.
+        self.overlay_images = []
+        y = 10
+        for row in rows:
+            for x, text in zip((10, 110, 190), row):
+                image = self.font.render(text, True, (0, 0, 0),
+                        (255, 255, 255))
+                self.overlay_images.append((image, (x, y)))
+            y += self.font.get_linesize()
+        self.version += 1
+
+    def draw_overlay(self, surface):
+        """Draw the overlay in the top left corner, and return its rects."""
+        if not self.show_overlay:
+            return []
+        return surface.blits(self.overlay_images)
+
+    def export_csv(self, path):
+        """Write every stored frame to a CSV file, times in milliseconds."""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame'] + [f"{phase}_ms" for phase in
+                    self.phases] + list(self.counters))
+
+            first = max(0, self.frame_count - len(self.frames))
+            for number, row in enumerate(self.history(), first):
+                times = [f"{t * 1000:.4f}" for t in row[:len(self.phases)]]
+                counts = [int(c) for c in row[len(self.phases):]]
+                writer.writerow([number] + times + counts)
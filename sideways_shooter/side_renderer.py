@@ -0,0 +1,114 @@
+import pygame
+
+# Events after which the window's contents may have been lost, so the
+#   whole screen has to be pushed again.
+REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED,
+        pygame.WINDOWRESTORED, pygame.WINDOWFOCUSGAINED)
+
+def open_fixed_window(settings):
+    """
+    Open a fullscreen window for a game played at a fixed size.
+
+    Returns the surface to draw the game on, and a ScaledDisplay to show
+      it through, or None when the game draws on the window directly.
+    """
+    size = (settings.screen_width, settings.screen_height)
+    scale = settings.render_scales[settings.render_quality]
+    if scale == 1:
+        # pygame scales each frame up to fill the display.
+        return pygame.display.set_mode(size, pygame.FULLSCREEN |
+                pygame.SCALED), None
+
+    scaled = ScaledDisplay(size, (round(size[0] * scale),
+            round(size[1] * scale)))
+    return scaled.surface, scaled
+
+class ScaledDisplay:
+    """
+    A class to show a game drawn at one size in a smaller window.
+
+    The game is drawn at its own size on an offscreen surface, which is
+      scaled down onto the window once a frame. pygame then scales the
+      window up to fill the display, so fewer pixels reach it.
+    """
+
+    def __init__(self, size, window_size):
+        """Open the window, and make the surface the game draws on."""
+        self.window = pygame.display.set_mode(window_size,
+                pygame.FULLSCREEN | pygame.SCALED)
+        self.surface = pygame.Surface(size).convert()
+        self.scale_x = size[0] / window_size[0]
+        self.scale_y = size[1] / window_size[1]
+
+    def present(self):
+        """Scale the finished frame onto the window, and show it."""
+        pygame.transform.scale(self.surface, self.window.get_size(),
+                self.window)
+        pygame.display.flip()
+
+    def mouse_pos(self):
+        """Return where the mouse is on the surface the game draws on."""
+        x, y = pygame.mouse.get_pos()
+        return int(x * self.scale_x), int(y * self.scale_y)
+
+class DirtyRenderer:
+    """
+    A class to redraw and push only the parts of the screen that changed.
+
+    Sprites move every frame, so the places they were drawn last frame
+      are painted over with the background and pushed along with the
+      places they are drawn now. Overlays such as the scoreboard and the
+      Play buttons are redrawn every frame but only pushed to the display
+      when they change.
+    """
+
+    def __init__(self, screen, bg_color):
+        """Initialize the renderer for the given screen."""
+        self.screen = screen
+        self.background = pygame.Surface(screen.get_size())
+        self.background.fill(bg_color)
+
+        # What was drawn last frame.
+        self.sprite_rects = []
+        self.overlay_rects = []
+        self.overlay_key = None
+
+        # The first frame always covers the whole screen.
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Redraw and push the whole screen on the next frame."""
+        self.full_redraw = True
+
+    def begin_frame(self, overlay_key):
+        """
+        Erase everything that moved or changed since last frame.
+
+        overlay_key is any value that changes whenever the overlays do.
+        """
+        self.overlay_changed = overlay_key != self.overlay_key
+        self.overlay_key = overlay_key
+
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            return
+
+        erase = self.sprite_rects
+        if self.overlay_changed:
+            erase = erase + self.overlay_rects
+        self.screen.blits([(self.background, rect, rect) for rect in erase],
+                False)
+
+    def end_frame(self, sprite_rects, overlay_rects):
+        """Push the parts of the screen drawn this frame to the display."""
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            dirty = self.sprite_rects + sprite_rects
+            if self.overlay_changed:
+                dirty += self.overlay_rects + overlay_rects
+            pygame.display.update(dirty)
+
+        self.sprite_rects = sprite_rects
+        self.overlay_rects = overlay_rects
@@ -0,0 +1,210 @@
+"""
+Record the input of a game, and replay it at full speed.
+
+Input only matters at the tick it's handled on, and the simulation runs
+  on a fixed timestep, so a list of tick-stamped key presses and game
+  starts is enough to play a whole session back exactly.
+
+    python side_replay.py session.ssr
+"""
+import atexit
+import struct
+from bisect import bisect_left, bisect_right
+import sys
+from time import perf_counter
+
+import pygame
+
+# The games a replay can belong to.
+SIDE_ATTACK = 0
+TARGET_PRACTICE = 1
+
+# What happened at a tick.
+KEYDOWN = 0
+KEYUP = 1
+START = 2
+
+# Only these keys affect play.
+RECORDED_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE, pygame.K_p)
+
+# The file starts with the game, screen size, the tick recording stopped
+#   at, and the final score, level and ships left. Then comes one record
+#   for each event: its tick, its kind, and the key or difficulty.
+MAGIC = b'SSR1'
+HEADER = struct.Struct('<4sBHHIqHH')
+EVENT = struct.Struct('<IBI')
+
+class InputRecorder:
+    """A class to record the input that reaches a game."""
+
+    def __init__(self, game, kind, path):
+        """
+        Start recording game, and save the recording to path on exit.
+
+        kind says which game is being recorded.
+        """
+        self.game = game
+        self.kind = kind
+        self.path = path
+        self.events = bytearray()
+        atexit.register(self.save)
+
+    def record(self, kind, value):
+        """Record an event at the game's current tick."""
+        self.events += EVENT.pack(self.game.ticks, kind, value)
+
+    def record_event(self, event):
+        """Record a key press or release if it affects play."""
+        if event.key not in RECORDED_KEYS:
+            return
+        if event.type == pygame.KEYDOWN:
+            self.record(KEYDOWN, event.key)
+        elif event.type == pygame.KEYUP:
+            self.record(KEYUP, event.key)
+
+    def save(self):
+        """Write the recording, and how the game ended up, to the file."""
+        game = self.game
+        header = HEADER.pack(MAGIC, self.kind, game.settings.screen_width,
+                game.settings.screen_height, game.ticks, int(game.stats.score),
+                game.stats.level, game.stats.ships_left)
+        with open(self.path, 'wb') as f:
+            f.write(header + self.events)
+
+class Replay:
+    """
+    A class to hold a recording read back from a file.
+
+    While a recording plays, the whole game is saved every keyframe_ticks
+      ticks, so seeking back to any tick already played only means
+      restoring the keyframe before it and playing on from there.
+    """
+
+    def __init__(self, path, keyframe_ticks=2400):
+        """Read a recording, keeping a keyframe every keyframe_ticks."""
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        (magic, self.kind, self.screen_width, self.screen_height,
+            self.end_tick, self.score, self.level,
+            self.ships_left) = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Side Attack replay")
+
+        self.events = list(EVENT.iter_unpack(data[HEADER.size:]))
+        self.event_ticks = [event[0] for event in self.events]
+
+        # Saved game states, and the ticks they were saved at, in order.
+        self.keyframe_ticks = keyframe_ticks
+        self.keyframes = {}
+        self.keyframe_order = []
+
+    def make_game(self):
+        """Return a headless game set up like the recorded one."""
+        from side_settings import Settings
+        if self.kind == SIDE_ATTACK:
+            from side_attack import SideAttack as Game
+        else:
+            from side_target_practice import TargetPractice as Game
+
+        settings = Settings()
+        settings.screen_width = self.screen_width
+        settings.screen_height = self.screen_height
+        return Game(headless=True, settings=settings)
+
+    def play(self, game=None, until=None):
+        """
+        Feed the recording to a headless game as fast as possible.
+
+        Plays a new game, or carries on with game from the tick it's at,
+          to the end of the recording or to tick until, and returns the
+          game.
+        """
+        if game is None:
+            game = self.make_game()
+        if until is None:
+            until = self.end_tick
+
+        # Skip the events the game has already had.
+        first = bisect_left(self.event_ticks, game.ticks)
+        events = iter(self.events[first:])
+        event = next(events, None)
+        while game.ticks < until:
+            if not game.ticks % self.keyframe_ticks:
+                self._save_keyframe(game)
+            while event and event[0] <= game.ticks:
+                self._apply(game, event)
+                event = next(events, None)
+            game._update_game()
+        return game
+
+    def seek(self, tick, game=None):
+        """
+        Return a game at tick, starting from the nearest earlier keyframe.
+
+        game is reused if it's given and from this recording. Ticks past
+          the last keyframe are played from there, saving keyframes on
+          the way, so seeking later is quick too.
+        """
+        if game is None:
+            game = self.make_game()
+
+        # Find the last keyframe at or before tick, unless the game is
+        #   already between that keyframe and tick.
+        number = bisect_right(self.keyframe_order, tick)
+        start = self.keyframe_order[number - 1] if number else 0
+        if not start <= game.ticks <= tick:
+            if number:
+                game.restore_state(self.keyframes[start])
+            else:
+                game = self.make_game()
+        return self.play(game, tick)
+
+    def _save_keyframe(self, game):
+        """Save the game at its current tick, if it hasn't been already."""
+        if game.ticks in self.keyframes:
+            return
+        self.keyframes[game.ticks] = game.save_state()
+        self.keyframe_order.insert(
+                bisect_left(self.keyframe_order, game.ticks), game.ticks)
+
+    def _apply(self, game, event):
+        """Hand a recorded event to the game the way the player did."""
+        tick, kind, value = event
+        if kind == START:
+            if self.kind == SIDE_ATTACK:
+                game.start_game(value)
+            else:
+                game.start_game()
+        elif kind == KEYDOWN:
+            game._check_keydown_events(
+                    pygame.event.Event(pygame.KEYDOWN, key=value))
+        else:
+            game._check_keyup_events(
+                    pygame.event.Event(pygame.KEYUP, key=value))
+
+    def matches(self, game):
+        """Return True if game ended the way the recorded game did."""
+        return (game.stats.score == self.score and
+                game.stats.level == self.level and
+                game.stats.ships_left == self.ships_left)
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("usage: python side_replay.py <replay file>")
+
+    replay = Replay(sys.argv[1])
+    start = perf_counter()
+    game = replay.play()
+    elapsed = perf_counter() - start
+
+    print(f"Replayed {replay.end_tick} ticks in {elapsed:.2f} s.")
+    print(f"Score {game.stats.score}, level {game.stats.level}, "
+            f"{game.stats.ships_left} ships left.")
+    if not replay.matches(game):
+        print(f"Recorded score {replay.score}, level {replay.level}, "
+                f"{replay.ships_left} ships left.")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,25 @@
-import json
-
-filename = 'side_high_score.json'
-
-class HighestScore:
-    """Tracks the highest score attained in Side Attack."""
-
-    def __init__(self):
-        """Nothing to do."""
-        pass
-
-    def load_score(self):
-        # Retrieves the highest recorded score unless there is none.
-        try:
-            with open(filename) as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return 0
-
-    def save_score(self, new_score):
-        # Replaces the highest recorded score.
-        try:
-            with open(filename, 'w') as f:
-                json.dump(new_score, f)
-        except FileNotFoundError:
-            with open(filename, 'w') as f:
-                json.dump(new_score, f)
\ No newline at end of file
+class HighestScore:
+    """
+    Tracks the highest score attained in Side Attack.
+
+    Every finished game is kept in the leaderboard, so the record is the
+      best score there. A new record is kept in memory until the game
+      that set it is recorded.
+    """
+
+    def __init__(self, leaderboard=None):
+        """
+        Load the best score from the leaderboard.
+
+        With no leaderboard the score is only kept in memory.
+        """
+        self.leaderboard = leaderboard
+        self.score = leaderboard.best_score() if leaderboard else 0
+
+    def load_score(self):
+        # Returns the highest recorded score.
+        return self.score
+
+    def save_score(self, new_score):
+        # Replaces the highest recorded score.
+        self.score = new_score
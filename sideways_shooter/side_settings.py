@@ -1,73 +1,163 @@
-import pygame
-
-class Settings:
-    """A class to store all settings for Alien Invasion."""
-
-    def __init__(self):
-        """Initialize the game's settings."""
-        # Screen settings
-        self.screen_width = 1200
-        self.screen_height = 800
-        self.bg_color = (230, 230, 230)
-
-        # Ship settings
-        self.ship_speed = 1.5
-        self.ship_limit = 3
-
-        # Bullet settings
-        self.bullet_width = 15
-        self.bullet_height = 3
-        self.bullet_color = (60, 60, 60)
-        self.bullets_allowed = 3
-
-        # Alien settings
-        self.fleet_drop_speed = 10
-
-        # Target settings
-        self.target_width = 30
-        self.target_height = 150
-        self.target_color = (255, 50, 50)
-        self.target_direction = 1
-        
-        # How quickly the game speeds up
-        self.speedup_scale = 1.1
-
-        # How quickly the point values increase
-        self.score_scale = 1.5
-
-        # Whether the game is paused or not
-        self.paused = False
-
-    def initialize_dynamic_settings(self, difficulty):
-        """Initialize settings that change throughout the game."""
-        self.ship_speed = 1.5
-        self.bullet_speed = 3.0
-        
-        if difficulty == 1:
-            self.alien_speed = 0.8
-        elif difficulty == 2:
-            self.alien_speed = 1
-        else:
-            self.alien_speed = 1.2
-
-        self.target_speed = 1.5
-
-        # fleet_direction of 1 represents right; -1 represents left.
-        self.fleet_direction = 1
-
-        # Scoring
-        self.alien_points = 50
-
-    def increase_speed(self):
-        """Increase speed settings."""
-        self.ship_speed *= self.speedup_scale
-        self.bullet_speed *= self.speedup_scale
-        self.alien_speed *= self.speedup_scale
-        self.target_speed *= self.speedup_scale
-
-        self.alien_points = int(self.alien_points * self.score_scale)
-
-    def _pause_game(self, paused):
-        """Handles pausing and unpausing."""
-        self.paused = paused
-        pygame.mouse.set_visible(paused)
\ No newline at end of file
+import os
+
+class Settings:
+    """A class to store all settings for Alien Invasion."""
+
+    # The settings initialize_dynamic_settings() sets again whenever a
+    #   game starts.
+    DYNAMIC_SETTINGS = ('ship_speed', 'bullet_speed', 'alien_speed',
+            'target_speed', 'fleet_direction', 'alien_points')
+
+    def __init__(self):
+        """Initialize the game's settings."""
+        # Timing settings. The game runs tick_rate ticks every second
+        #   however fast it draws. Speeds are set in pixels per second,
+        #   and turned into pixels per tick when a game starts, so the
+        #   tick rate only changes how finely the game is simulated.
+        self.tick_rate = 240
+        self.max_fps = 60
+        self.max_ticks_per_frame = 24
+
+        # Screen settings
+        self.screen_width = 1200
+        self.screen_height = 800
+        self.bg_color = (230, 230, 230)
+
+        # Play at screen_width by screen_height whatever size the display
+        #   is, scaled up to fill it, so every display plays the same
+        #   game. render_quality picks what fraction of that size frames
+        #   are shown at; lower qualities push fewer pixels to the display
+        #   for a higher frame rate, and play exactly the same.
+        self.fixed_resolution = False
+        self.render_quality = 'high'
+        self.render_scales = {
+            'low': 0.5,
+            'medium': 0.75,
+            'high': 1.0,
+        }
+
+        # Redraw only what changed instead of the whole screen each frame.
+        self.dirty_rendering = False
+
+        # Frame profiling. F3 shows the overlay, and setting profile_csv
+        #   to a path writes the last profile_history frames there on exit.
+        self.profile_frames = False
+        self.profile_history = 3600
+        self.profile_csv = None
+
+        # Print how long each part of starting up took, once the first
+        #   frame is on screen.
+        self.startup_profile = False
+
+        # Record every game's input to this file, to replay it later.
+        self.record_replay = None
+
+        # Run the simulation on a thread of its own, so slow drawing
+        #   doesn't hold up ticks and slow ticks don't hold up drawing.
+        self.threaded_simulation = False
+
+        # Read the arrow keys and space bar at every tick instead of
+        #   waiting for their events once a frame. This only works when
+        #   the simulation runs on the main thread.
+        self.sample_input_per_tick = False
+
+        # Input latency. track_latency prints how long input took to
+        #   reach the screen on exit, and setting latency_csv to a path
+        #   writes the last latency_history inputs there.
+        self.track_latency = False
+        self.latency_history = 10000
+        self.latency_csv = None
+
+        # Metrics export. Every metrics_interval seconds, metrics_exporter
+        #   sends out the frame rate, frame times, entity counts, level,
+        #   score and leaderboard I/O time: 'statsd' sends them over UDP
+        #   to metrics_statsd, and 'textfile' writes them to
+        #   metrics_textfile for Prometheus's textfile collector.
+        self.metrics_exporter = None
+        self.metrics_interval = 10
+        self.metrics_statsd = ('127.0.0.1', 8125)
+        self.metrics_textfile = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'side_metrics.prom')
+
+        # Ship settings
+        self.ship_speed_per_second = 360
+        self.ship_limit = 3
+
+        # How long the game waits, in seconds, for a new ship to arrive.
+        self.respawn_time = 0.5
+
+        # Bullet settings
+        self.bullet_speed_per_second = 720
+        self.bullet_width = 15
+        self.bullet_height = 3
+        self.bullet_color = (60, 60, 60)
+        self.bullets_allowed = 3
+
+        # Alien settings. The fleet's speed is for normal difficulty, and
+        #   is slower when easy and faster when hard.
+        self.alien_speed_per_second = 240
+        self.fleet_drop_speed = 10
+
+        # Target settings
+        self.target_speed_per_second = 360
+        self.target_width = 30
+        self.target_height = 150
+        self.target_color = (255, 50, 50)
+        self.target_direction = 1
+        
+        # How quickly the game speeds up
+        self.speedup_scale = 1.1
+
+        # How quickly the point values increase
+        self.score_scale = 1.5
+
+        # Where every finished game, and so the all time high score, is
+        #   kept.
+        self.leaderboard_file = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'side_leaderboard.db')
+
+        # Where older versions kept the all time high score, which is
+        #   added to the leaderboard once.
+        self.high_score_file = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'side_high_score.json')
+
+        # Whether the game is paused or not
+        self.paused = False
+
+        self.initialize_dynamic_settings()
+
+    def initialize_dynamic_settings(self, difficulty=2):
+        """Initialize settings that change throughout the game."""
+        # Speeds are kept in pixels per tick while a game is played.
+        self.ship_speed = self.ship_speed_per_second / self.tick_rate
+        self.bullet_speed = self.bullet_speed_per_second / self.tick_rate
+        
+        if difficulty == 1:
+            scale = 0.8
+        elif difficulty == 2:
+            scale = 1
+        else:
+            scale = 1.2
+        self.alien_speed = (self.alien_speed_per_second * scale /
+                self.tick_rate)
+
+        self.target_speed = self.target_speed_per_second / self.tick_rate
+
+        # fleet_direction of 1 represents right; -1 represents left.
+        self.fleet_direction = 1
+
+        # Scoring
+        self.alien_points = 50
+
+    def increase_speed(self):
+        """Increase speed settings."""
+        self.ship_speed *= self.speedup_scale
+        self.bullet_speed *= self.speedup_scale
+        self.alien_speed *= self.speedup_scale
+        self.target_speed *= self.speedup_scale
+
+        self.alien_points = int(self.alien_points * self.score_scale)
+
+    def _pause_game(self, paused):
+        """Handles pausing and unpausing."""
+        self.paused = paused
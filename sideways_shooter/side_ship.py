@@ -1,46 +1,59 @@
-import pygame
-from pygame.sprite import Sprite
-
-class Ship(Sprite):
-    """A class to manage the ship."""
-
-    def __init__(self, ss_game):
-        """Initialize the ship and set its starting position."""
-        super().__init__()
-        self.screen = ss_game.screen
-        self.settings = ss_game.settings
-        self.screen_rect = ss_game.screen.get_rect()
-
-        # Load the ship image and get its rect.
-        self.image = pygame.image.load('C:/Users/noahm/Documents/python/sideways_shooter/images/ship.bmp')
-        self.rect = self.image.get_rect()
-
-        # Start each new ship at the center left of the screen.
-        self.rect.midleft = self.screen_rect.midleft
-
-        # Store a decimal value for the ship's vertical position.
-        self.y = float(self.rect.y)
-
-        # Movement flag
-        self.moving_down = False
-        self.moving_up = False
-
-    def update(self):
-        """Update the ship's position based on movement flags."""
-        # Update the ship's y value, not the rect.
-        if self.moving_down and self.rect.bottom < self.screen_rect.bottom:
-            self.y += self.settings.ship_speed
-        if self.moving_up and self.rect.top > self.screen_rect.top:
-            self.y -= self.settings.ship_speed
-
-        # Update rect object from self.y.
-        self.rect.y = self.y
-
-    def blitme(self):
-        """Draw the ship at its current location."""
-        self.screen.blit(self.image, self.rect)
-
-    def center_ship(self):
-        """Center the ship on the screen."""
-        self.rect.midleft = self.screen_rect.midleft
-        self.y = float(self.rect.y)
\ No newline at end of file
+from pygame.sprite import Sprite
+
+from side_assets import assets
+
+class Ship(Sprite):
+    """A class to manage the ship."""
+
+    def __init__(self, ss_game):
+        """Initialize the ship and set its starting position."""
+        super().__init__()
+        self.screen = ss_game.screen
+        self.settings = ss_game.settings
+        self.screen_rect = ss_game.screen.get_rect()
+
+        # Get the shared ship image and its rect.
+        self.image = assets.image('ship.bmp')
+        self.rect = self.image.get_rect()
+
+        # Start each new ship at the center left of the screen.
+        self.rect.midleft = self.screen_rect.midleft
+
+        # Store a decimal value for the ship's vertical position,
+        #   and where it was on the previous tick.
+        self.y = float(self.rect.y)
+        self.prev_y = self.y
+
+        # Movement flag
+        self.moving_down = False
+        self.moving_up = False
+
+    def update(self):
+        """Update the ship's position based on movement flags."""
+        # Update the ship's y value, not the rect.
+        self.prev_y = self.y
+        if self.moving_down and self.rect.bottom < self.screen_rect.bottom:
+            self.y += self.settings.ship_speed
+        if self.moving_up and self.rect.top > self.screen_rect.top:
+            self.y -= self.settings.ship_speed
+
+        # Update rect object from self.y.
+        self.rect.y = self.y
+
+    def blitme(self, alpha=1.0, snapshot=None):
+        """
+        Draw the ship alpha of the way from its last tick to this one.
+
+        snapshot can give the previous and current y to draw at instead
+          of the ship's own. Returns the rect that was drawn.
+        """
+        prev_y, y = snapshot or (self.prev_y, self.y)
+        rect = self.rect.copy()
+        rect.y = prev_y + (y - prev_y) * alpha
+        return self.screen.blit(self.image, rect)
+
+    def center_ship(self):
+        """Center the ship on the screen."""
+        self.rect.midleft = self.screen_rect.midleft
+        self.y = float(self.rect.y)
+        self.prev_y = self.y
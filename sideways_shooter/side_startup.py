@@ -0,0 +1,51 @@
+from time import perf_counter
+
+import pygame
+
+def init_pygame(headless=False):
+    """
+    Initialize only the parts of pygame the games use.
+
+    pygame.init() starts every module, audio and joysticks included,
+      and the games never use either. Fonts are started when the first
+      one is loaded, and a headless game doesn't need a display at all.
+    """
+    if not headless:
+        pygame.display.init()
+
+class StartupProfile:
+    """
+    A class to time each phase of starting a game.
+
+    The game marks the end of each phase as it starts up, and the time
+      since the previous mark is charged to that phase. Once the first
+      frame is on screen, the phases are printed if settings ask for it.
+    """
+
+    def __init__(self, settings):
+        """Start timing from now."""
+        self.enabled = settings.startup_profile
+        self.started = self.last_mark = perf_counter()
+        self.phases = {}
+
+    def mark(self, phase):
+        """Charge the time since the last mark to phase."""
+        if self.enabled:
+            now = perf_counter()
+            self.phases[phase] = self.phases.get(phase, 0) + now - self.last_mark
+            self.last_mark = now
+
+    def first_frame(self):
+        """Note that the first frame is on screen, and print the phases."""
+        if not self.enabled:
+            return
+        self.mark('first frame')
+        self.enabled = False
+        self.report()
+
+    def report(self):
+        """Print the time each phase took, and the total."""
+        print("Startup:")
+        for phase, seconds in self.phases.items():
+            print(f"  {phase:<12} {seconds * 1000:8.2f} ms")
+        print(f"  {'total':<12} {(self.last_mark - self.started) * 1000:8.2f} ms")
@@ -0,0 +1,36 @@
+from collections import namedtuple
+
+import numpy as np
+
+# A whole game at one tick: its single values packed into one array, in
+#   the order the game lists them, and the state of its bullets and of
+#   its aliens or target.
+GameState = namedtuple('GameState', 'tick values bullets sprites')
+
+def pack_values(game, fields):
+    """
+    Gather single values from around a game into one array.
+
+    fields lists each value as a dotted attribute path from the game
+      and the type it's restored as. Every type used fits exactly in a
+      float64, scores included.
+    """
+    values = np.empty(len(fields))
+    for i, (path, _) in enumerate(fields):
+        owner, name = _owner(game, path)
+        values[i] = getattr(owner, name)
+    return values
+
+def unpack_values(game, fields, values):
+    """Put values gathered by pack_values() back where they came from."""
+    for (path, kind), value in zip(fields, values.tolist()):
+        owner, name = _owner(game, path)
+        setattr(owner, name, kind(value))
+
+def _owner(game, path):
+    """Return the object holding a dotted attribute, and its name."""
+    *parents, name = path.split('.')
+    owner = game
+    for parent in parents:
+        owner = getattr(owner, parent)
+    return owner, name
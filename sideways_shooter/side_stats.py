@@ -1,19 +1,22 @@
-class GameStats:
-    """Track statistics for Side Attack."""
-
-    def __init__(self, ss_game):
-        """Initialize statistics."""
-        self.settings = ss_game.settings
-        self.reset_stats()
-
-        # Start Side Attack in an active state.
-        self.game_active = False
-
-        # High score should never be reset.
-        self.high_score = 0
-
-    def reset_stats(self):
-        """Initialize statistics that can change during the game."""
-        self.ships_left = self.settings.ship_limit
-        self.score = 0
-        self.level = 1
\ No newline at end of file
+class GameStats:
+    """Track statistics for Side Attack."""
+
+    def __init__(self, ss_game):
+        """Initialize statistics."""
+        self.settings = ss_game.settings
+        self.reset_stats()
+
+        # Start Side Attack in an active state.
+        self.game_active = False
+
+        # High score should never be reset.
+        self.high_score = 0
+
+    def reset_stats(self):
+        """Initialize statistics that can change during the game."""
+        self.ships_left = self.settings.ship_limit
+        self.score = 0
+        self.level = 1
+
+        # Ticks left before a new ship is ready to play.
+        self.respawn_ticks = 0
@@ -1,36 +1,52 @@
-import pygame
-from pygame.sprite import Sprite
-
-class Target(Sprite):
-    """A class to manage the target."""
-
-    def __init__(self, tp_game):
-        """Create a target object at the right of the screen."""
-        super().__init__()
-        self.screen = tp_game.screen
-        self.settings = tp_game.settings
-        self.color = self.settings.target_color
-
-        # Start the target near the top right of the screen.
-        self.rect = pygame.Rect(0, 0, self.settings.target_width,
-            self.settings.target_height)
-        self.rect.x = self.rect.width
-        self.rect.y = self.rect.height
-
-        # Store the target's exact vertical position.
-        self.y = float(self.rect.y)
-
-    def check_edges(self):
-        """Return True if target is at edge of screen."""
-        screen_rect = self.screen.get_rect()
-        if self.rect.bottom >= screen_rect.bottom or self.rect.top <= 0:
-            return True
-
-    def update(self):
-        """Move the target up or down."""
-        self.y += self.settings.target_speed * self.settings.target_direction
-        self.rect.y = self.y
-
-    def draw_target(self):
-        """Draw the target to the screen."""
-        pygame.draw.rect(self.screen, self.color, self.rect)
\ No newline at end of file
+import pygame
+from pygame.sprite import Sprite
+
+class Target(Sprite):
+    """A class to manage the target."""
+
+    def __init__(self, tp_game):
+        """Create a target object at the right of the screen."""
+        super().__init__()
+        self.screen = tp_game.screen
+        self.settings = tp_game.settings
+        self.color = self.settings.target_color
+
+        # Draw the target from an image filled once, instead of filling
+        #   a rect on the screen every frame.
+        self.image = pygame.Surface((self.settings.target_width,
+            self.settings.target_height))
+        self.image.fill(self.color)
+
+        # Start the target near the top right of the screen.
+        self.rect = self.image.get_rect()
+        self.rect.x = self.rect.width
+        self.rect.y = self.rect.height
+
+        # Store the target's exact vertical position,
+        #   and where it was on the previous tick.
+        self.y = float(self.rect.y)
+        self.prev_y = self.y
+
+    def check_edges(self):
+        """Return True if target is at edge of screen."""
+        screen_rect = self.screen.get_rect()
+        if self.rect.bottom >= screen_rect.bottom or self.rect.top <= 0:
+            return True
+
+    def update(self):
+        """Move the target up or down."""
+        self.prev_y = self.y
+        self.y += self.settings.target_speed * self.settings.target_direction
+        self.rect.y = self.y
+
+    def draw_target(self, alpha=1.0, snapshot=None):
+        """
+        Draw the target alpha of the way from its last tick to this one.
+
+        snapshot can give the previous and current y to draw at instead
+          of the target's own. Returns the rect that was drawn.
+        """
+        prev_y, y = snapshot or (self.prev_y, self.y)
+        rect = self.rect.copy()
+        rect.y = prev_y + (y - prev_y) * alpha
+        return self.screen.blit(self.image, rect)
@@ -1,207 +1,531 @@
-import sys
-from time import sleep
-
-import pygame
-
-from side_settings import Settings
-from side_stats import GameStats
-from side_button import Button
-from side_ship import Ship
-from side_bullet import Bullet
-from side_target import Target
-
-class TargetPractice:
-    """Overall class to manage game assets and behavior."""
-
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        pygame.init()
-        self.settings = Settings()
-
-        # These lines are for fullscreen.
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        self.settings.screen_width = self.screen.get_rect().width
-        self.settings.screen_height = self.screen.get_rect().height
-
-        # These lines are for windowed.
-        # self.screen = pygame.display.set_mode(
-        #     (self.settings.screen_width, self.settings.screen_height))
-        
-        pygame.display.set_caption("Target Practice")
-
-        # Create an instance to store game statistics.
-        self.stats = GameStats(self)
-
-        self.ship = Ship(self)
-        self.bullets = pygame.sprite.Group()
-        self.target = pygame.sprite.Group()
-
-        self._create_target()
-
-        # Make the Play button.
-        self.play_button = Button(self, "Play")
-
-    def run_game(self):
-        """Start the main loop for the game."""
-        while True:
-            self._check_events()
-            
-            if self.stats.game_active:
-                self.ship.update()
-                self._update_bullets()
-                self._update_target()
-
-            self._update_screen()
-
-    def _check_events(self):
-        """Respond to keypresses and mouse events."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                self._check_keydown_events(event)
-            elif event.type == pygame.KEYUP:
-                self._check_keyup_events(event)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                self._check_play_button(mouse_pos)
-
-    def _check_keydown_events(self, event):
-        """Responds to keypresses."""
-        if event.key == pygame.K_DOWN:
-            self.ship.moving_down = True
-        if event.key == pygame.K_UP:
-            self.ship.moving_up = True
-        if event.key == pygame.K_SPACE:
-            self._fire_bullet()
-
-    def _check_keyup_events(self, event):
-        """Responds to key releases."""
-        if event.key == pygame.K_DOWN:
-            self.ship.moving_down = False
-        if event.key == pygame.K_UP:
-            self.ship.moving_up = False
-        if event.key == pygame.K_q:
-            sys.exit()
-        if event.key == pygame.K_p and not self.stats.game_active:
-            self._start_game()
-
-    def _check_play_button(self, mouse_pos):
-        """Start a new game when the player clicks Play."""
-        button_clicked = self.play_button.rect.collidepoint(mouse_pos)
-        if button_clicked and not self.stats.game_active:
-            self._start_game()
-            self.settings.initialize_dynamic_settings()
-
-    def _fire_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
-        if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
-
-    def _update_bullets(self):
-        """Update position of bullets and get rid of old bullets."""
-        # Update bullet positions.
-        self.bullets.update()
-
-        # Get rid of bullets that have disappeared.
-        for bullet in self.bullets.copy():
-            if bullet.rect.left >= self.settings.screen_width:
-                self.bullets.remove(bullet)
-                self._target_missed()
-
-        self._check_bullet_target_collisions()
-
-    def _check_bullet_target_collisions(self):
-        """Respond to bullet-target collisions."""
-        # Remove any bullets that have hit the target.
-        collisions = pygame.sprite.groupcollide(
-                self.bullets, self.target, True, False)
-        if collisions:
-            for bullet in self.bullets.copy():
-                self.bullets.remove(bullet)
-            self.settings.increase_speed()
-
-    def _create_target(self):
-        # Create the target.
-        target = Target(self)
-        target_width, target_height = target.rect.size
-        target.y = self.settings.screen_height // 2 - (target_height // 2)
-        target.rect.y = target.y
-        target.rect.x = self.settings.screen_width - target.rect.width
-        self.target.add(target)
-
-    def _update_target(self):
-        """
-        Check if the target is at an edge,
-          then update the position of the target.
-        """
-        self._check_target_edges()
-        self.target.update()
-
-    def _check_target_edges(self):
-        """Respond appropriately if the target has reached an edge."""
-        for target in self.target.sprites():
-            if target.check_edges():
-                self._change_target_direction()
-
-    def _change_target_direction(self):
-        """Change the target's direction."""
-        self.settings.target_direction *= -1
-
-    def _target_missed(self):
-        """Respond to the ship missing the target."""
-        if self.stats.ships_left > 0:
-            # Decrement ships left.
-            self.stats.ships_left -= 1
-
-            # Get rid of the target and bullets.
-            self.target.empty()
-            self.bullets.empty()
-        
-            # Create a new target and center the ship.
-            self._create_target()
-            self.ship.center_ship()
-
-            # Pause.
-            sleep(0.5)
-        else:
-            self.stats.game_active = False
-            pygame.mouse.set_visible(True)
-    
-    def _start_game(self):
-        """Starts a game of Target Practice."""
-        # Reset the game statistics.
-        self.stats.reset_stats()
-        self.stats.game_active = True
-
-        # Get rid of the target and bullets.
-        self.target.empty()
-        self.bullets.empty()
-
-        # Create a new target and center the ship.
-        self._create_target()
-        self.ship.center_ship()
-
-        # Hide the mouse cursor.
-        pygame.mouse.set_visible(False)
-
-    def _update_screen(self):
-        """Update images on the screen, and flip to the new screen."""
-        self.screen.fill(self.settings.bg_color)
-        self.ship.blitme()
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
-        for target in self.target.sprites():
-            target.draw_target()
-
-        # Draw the play button if the game is inactive.
-        if not self.stats.game_active:
-            self.play_button.draw_button()
-
-        pygame.display.flip()
-
-if __name__ == '__main__':
-    # Make a game instance, and run the game.
-    tp = TargetPractice()
-    tp.run_game()
\ No newline at end of file
+import argparse
+import sys
+from collections import namedtuple
+
+import pygame
+
+from side_settings import Settings
+from side_clock import GameClock
+from side_stats import GameStats
+from side_button import Button
+from side_ship import Ship
+from side_bullet import BulletPool
+from side_target import Target
+from side_fleet import _rect_round
+from side_renderer import DirtyRenderer, REDRAW_EVENTS, open_fixed_window
+from side_profiler import FrameProfiler
+from side_latency import InputLatency, TIMED_KEYS
+from side_metrics import GameMetrics
+from side_replay import InputRecorder, START, TARGET_PRACTICE
+from side_state import GameState, pack_values, unpack_values
+from side_threads import run_threaded
+from side_startup import StartupProfile, init_pygame
+
+# Everything drawing a frame needs, copied out of the game after a tick.
+Snapshot = namedtuple('Snapshot', 'game_active ship_visible ship bullets '
+        'targets')
+
+def _overlap_times(start, end, low, high):
+    """
+    Return when a value moving steadily from start to end is between low
+      and high, as a (first, last) span of the move from 0 to 1, or None
+      if it never is.
+    """
+    if start == end:
+        return (0.0, 1.0) if low < start < high else None
+
+    # Find when the value crosses each bound, in the order it does.
+    first, last = (low - start) / (end - start), (high - start) / (end - start)
+    if first > last:
+        first, last = last, first
+    first, last = max(first, 0.0), min(last, 1.0)
+    return (first, last) if first < last else None
+
+class TargetPractice:
+    """Overall class to manage game assets and behavior."""
+
+    # Every single value that changes as Target Practice is played,
+    #   saved and restored by save_state() and restore_state().
+    STATE_VALUES = (
+        ('ticks', int),
+        ('stats.game_active', bool),
+        ('stats.ships_left', int),
+        ('stats.score', int),
+        ('stats.level', int),
+        ('stats.respawn_ticks', int),
+        ('settings.paused', bool),
+        ('settings.ship_speed', float),
+        ('settings.bullet_speed', float),
+        ('settings.target_speed', float),
+        ('settings.target_direction', int),
+        ('ship.y', float),
+        ('ship.prev_y', float),
+        ('ship.moving_up', bool),
+        ('ship.moving_down', bool),
+    )
+
+    def __init__(self, headless=False, settings=None):
+        """
+        Initialize the game, and create game resources.
+
+        A headless game never opens a window; it draws to an offscreen
+          surface and is driven through step() instead of run_game().
+          Pass settings to play with something other than the defaults.
+        """
+        self.settings = settings or Settings()
+        self.headless = headless
+        self.renderer = None
+        self.scaled = None
+        self.mouse_visible = True
+        self.startup = StartupProfile(self.settings)
+        init_pygame(headless)
+        self.startup.mark('pygame')
+
+        if self.headless:
+            # Simulate on an offscreen surface at the configured size.
+            self.screen = pygame.Surface(
+                (self.settings.screen_width, self.settings.screen_height))
+        else:
+            if self.settings.fixed_resolution:
+                # Play at the configured size, shown at the quality's size.
+                self.screen, self.scaled = open_fixed_window(self.settings)
+            else:
+                # These lines are for fullscreen.
+                self.screen = pygame.display.set_mode((0, 0),
+                        pygame.FULLSCREEN)
+                self.settings.screen_width = self.screen.get_rect().width
+                self.settings.screen_height = self.screen.get_rect().height
+
+            # These lines are for windowed.
+            # self.screen = pygame.display.set_mode(
+            #     (self.settings.screen_width, self.settings.screen_height))
+
+            pygame.display.set_caption("Target Practice")
+
+            # Scaling touches every pixel anyway, so only draw what
+            #   changed when the game is drawn on the window itself.
+            if self.settings.dirty_rendering and not self.scaled:
+                self.renderer = DirtyRenderer(self.screen,
+                        self.settings.bg_color)
+        self.startup.mark('window')
+
+        # Create an instance to store game statistics.
+        self.stats = GameStats(self)
+
+        self.ship = Ship(self)
+        self.bullets = BulletPool(self)
+        self.target = pygame.sprite.Group()
+        self.profiler = FrameProfiler(self.settings,
+                ('events', 'ship', 'bullets', 'collisions', 'target', 'draw',
+                    'flip'),
+                ('bullets', 'targets'))
+        self.metrics = GameMetrics(self.settings, 'target_practice',
+                self.stats)
+        self.startup.mark('assets')
+
+        self._create_target()
+        self.startup.mark('target')
+
+        # Make the Play button.
+        self.play_button = Button(self, "Play")
+        self.startup.mark('buttons')
+
+        # Count every simulated tick, and record input if asked to.
+        self.ticks = 0
+        self.latency = InputLatency(self.settings)
+        self.keys_down = dict.fromkeys(TIMED_KEYS, False)
+
+        # Only the main thread can read the keyboard, so it's only
+        #   sampled at each tick when ticks run there.
+        self.sampling = (self.settings.sample_input_per_tick and
+                not self.headless and not self.settings.threaded_simulation)
+        self.recorder = None
+        if self.settings.record_replay:
+            self.recorder = InputRecorder(self, TARGET_PRACTICE,
+                    self.settings.record_replay)
+        self.startup.mark('input')
+
+    def run_game(self):
+        """Start the main loop for the game."""
+        if self.settings.threaded_simulation:
+            run_threaded(self)
+            return
+
+        self.clock = GameClock(self.settings)
+        while True:
+            # Wait for the next frame before timing it.
+            ticks = self.clock.ticks_due()
+            self.profiler.start_frame()
+
+            self._check_events()
+            self.profiler.mark('events')
+            for _ in range(ticks):
+                self._update_game()
+            self._update_screen(self.clock.alpha)
+
+    def step(self, n_ticks=1, inputs=()):
+        """
+        Advance the game n_ticks without pumping events or drawing.
+
+        inputs holds the actions applied on every tick: 'up' and 'down'
+          steer the ship, and 'fire' shoots whenever a bullet is free.
+        Returns True while the game is still active.
+        """
+        self.ship.moving_up = 'up' in inputs
+        self.ship.moving_down = 'down' in inputs
+        fire = 'fire' in inputs
+
+        for _ in range(n_ticks):
+            if not self.stats.game_active:
+                break
+            if fire:
+                self._fire_bullet()
+            self._update_game()
+
+        return self.stats.game_active
+
+    def save_state(self):
+        """
+        Return everything needed to put the game back at this tick.
+
+        Takes a few array copies, so it's cheap enough to do often.
+        """
+        target = self.target.sprites()[0]
+        return GameState(self.ticks, pack_values(self, self.STATE_VALUES),
+                self.bullets.state(), (target.y, target.prev_y))
+
+    def restore_state(self, state):
+        """Put the game back the way save_state() found it."""
+        unpack_values(self, self.STATE_VALUES, state.values)
+        self.bullets.restore(state.bullets)
+        self.ship.rect.y = self.ship.y
+
+        target = self.target.sprites()[0]
+        target.y, target.prev_y = state.sprites
+        target.rect.y = target.y
+
+    def _update_game(self):
+        """Advance the simulation by a single tick."""
+        if self.sampling:
+            self._sample_keys()
+            self.profiler.mark('events')
+
+        self.ticks += 1
+        if self.stats.game_active:
+            if self.stats.respawn_ticks:
+                # Hold everything still while the new ship arrives.
+                self.stats.respawn_ticks -= 1
+                self.latency.discard_seen()
+                return
+
+            self.ship.update()
+            self.profiler.mark('ship')
+            self._update_bullets()
+            self._update_target()
+            self.profiler.mark('target')
+            self.latency.tick_done()
+        else:
+            self.latency.discard_seen()
+
+    def _check_events(self):
+        """Respond to keypresses and mouse events."""
+        self.latency.read_input()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                sys.exit()
+            elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                if event.key in TIMED_KEYS:
+                    if self.sampling:
+                        # These keys are read at every tick instead.
+                        continue
+                    self.latency.input_seen()
+                if self.recorder:
+                    self.recorder.record_event(event)
+                if event.type == pygame.KEYDOWN:
+                    self._check_keydown_events(event)
+                else:
+                    self._check_keyup_events(event)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if self.scaled:
+                    mouse_pos = self.scaled.mouse_pos()
+                else:
+                    mouse_pos = pygame.mouse.get_pos()
+                self._check_play_button(mouse_pos)
+            elif event.type in REDRAW_EVENTS and self.renderer:
+                self.renderer.invalidate()
+
+    def _sample_keys(self):
+        """Read the keyboard, and respond to any timed key that changed."""
+        pygame.event.pump()
+        pressed = pygame.key.get_pressed()
+        self.latency.read_input()
+        for key, was_down in self.keys_down.items():
+            if pressed[key] == was_down:
+                continue
+            self.keys_down[key] = pressed[key]
+            self.latency.input_seen()
+
+            # Handle the change just like its event, so it's recorded
+            #   and replayed the same way too.
+            if pressed[key]:
+                event = pygame.event.Event(pygame.KEYDOWN, key=key)
+            else:
+                event = pygame.event.Event(pygame.KEYUP, key=key)
+            if self.recorder:
+                self.recorder.record_event(event)
+            if pressed[key]:
+                self._check_keydown_events(event)
+            else:
+                self._check_keyup_events(event)
+
+    def _check_keydown_events(self, event):
+        """Responds to keypresses."""
+        if event.key == pygame.K_DOWN:
+            self.ship.moving_down = True
+        if event.key == pygame.K_UP:
+            self.ship.moving_up = True
+        if event.key == pygame.K_F3:
+            self.profiler.toggle_overlay()
+        if event.key == pygame.K_SPACE:
+            self._fire_bullet()
+
+    def _check_keyup_events(self, event):
+        """Responds to key releases."""
+        if event.key == pygame.K_DOWN:
+            self.ship.moving_down = False
+        if event.key == pygame.K_UP:
+            self.ship.moving_up = False
+        if event.key == pygame.K_q:
+            sys.exit()
+        if event.key == pygame.K_p and not self.stats.game_active:
+            self.start_game()
+
+    def _check_play_button(self, mouse_pos):
+        """Start a new game when the player clicks Play."""
+        button_clicked = self.play_button.rect.collidepoint(mouse_pos)
+        if button_clicked and not self.stats.game_active:
+            if self.recorder:
+                self.recorder.record(START, 0)
+            self.start_game()
+
+    def start_game(self):
+        """Start a new game of Target Practice."""
+        self._start_game()
+        self.settings.initialize_dynamic_settings()
+
+    def _fire_bullet(self):
+        """Fire a new bullet from the ship if one is allowed."""
+        if self.stats.respawn_ticks:
+            return
+        if len(self.bullets) < self.settings.bullets_allowed:
+            self.bullets.fire(self.ship.rect.midleft)
+
+    def _update_bullets(self):
+        """Update position of bullets and get rid of old bullets."""
+        self.bullets.move()
+        self.profiler.mark('bullets')
+
+        # Look for hits before getting rid of the bullets that have left
+        #   the screen, so a bullet that passed through the target on
+        #   its way off the screen still counts.
+        self._check_bullet_target_collisions()
+        self.profiler.mark('collisions')
+
+        # Every bullet that disappeared missed the target.
+        missed = self.bullets.cull()
+        for _ in range(missed):
+            self._target_missed()
+        self.profiler.mark('bullets')
+
+    def _check_bullet_target_collisions(self):
+        """Respond to bullet-target collisions."""
+        # Remove all the bullets once any of them hits the target.
+        for target in self.target.sprites():
+            for slot in self.bullets.slots():
+                if self._swept_hit(slot, target):
+                    self.bullets.empty()
+                    self.settings.increase_speed()
+                    return
+
+    def _swept_hit(self, slot, target):
+        """
+        Return True if a bullet touched the target during its last move.
+
+        A fast bullet can jump right over the target in one tick, so
+          instead of only comparing where the two are now, both are
+          moved steadily from where they were on the last tick, and they
+          hit if their rects overlap at any moment along the way.
+        """
+        bullets = self.bullets
+        rect = bullets.rect(slot)
+        prev_left = bullets.prev_left(slot)
+        prev_top = _rect_round(target.prev_y)
+
+        # The bullet only moves across and the target only moves up and
+        #   down, so find when they overlap along each axis separately.
+        across = _overlap_times(prev_left - target.rect.left,
+                rect.left - target.rect.left, -rect.width, target.rect.width)
+        if not across:
+            return False
+        down = _overlap_times(rect.top - prev_top, rect.top - target.rect.top,
+                -rect.height, target.rect.height)
+        if not down:
+            return False
+        return max(across[0], down[0]) < min(across[1], down[1])
+
+    def _create_target(self):
+        # Create the target.
+        target = Target(self)
+        target_width, target_height = target.rect.size
+        target.y = self.settings.screen_height // 2 - (target_height // 2)
+        target.rect.y = target.y
+        target.prev_y = target.y
+        target.rect.x = self.settings.screen_width - target.rect.width
+        self.target.add(target)
+
+    def _update_target(self):
+        """
+        Check if the target is at an edge,
+          then update the position of the target.
+        """
+        self._check_target_edges()
+        self.target.update()
+
+    def _check_target_edges(self):
+        """Respond appropriately if the target has reached an edge."""
+        for target in self.target.sprites():
+            if target.check_edges():
+                self._change_target_direction()
+
+    def _change_target_direction(self):
+        """Change the target's direction."""
+        self.settings.target_direction *= -1
+
+    def _target_missed(self):
+        """Respond to the ship missing the target."""
+        if self.stats.ships_left > 0:
+            # Decrement ships left.
+            self.stats.ships_left -= 1
+
+            # Get rid of the target and bullets.
+            self.target.empty()
+            self.bullets.empty()
+        
+            # Create a new target and center the ship.
+            self._create_target()
+            self.ship.center_ship()
+
+            # Pause while the new ship arrives.
+            self.stats.respawn_ticks = round(
+                self.settings.respawn_time * self.settings.tick_rate)
+        else:
+            self.stats.game_active = False
+    
+    def _start_game(self):
+        """Starts a game of Target Practice."""
+        # Reset the game statistics.
+        self.stats.reset_stats()
+        self.stats.game_active = True
+
+        # Get rid of the target and bullets.
+        self.target.empty()
+        self.bullets.empty()
+
+        # Create a new target and center the ship.
+        self._create_target()
+        self.ship.center_ship()
+
+    def _set_mouse_visible(self, visible):
+        """
+        Show or hide the mouse cursor when there is a window.
+
+        Only called while drawing, since the cursor can only be changed
+          from the main thread on some platforms, and ticks may run on
+          another.
+        """
+        if not self.headless and visible != self.mouse_visible:
+            pygame.mouse.set_visible(visible)
+            self.mouse_visible = visible
+
+    def _take_snapshot(self):
+        """Copy everything drawing needs out of the game."""
+        # Blink the new ship while it arrives.
+        blink_ticks = max(1, self.settings.tick_rate // 8)
+        return Snapshot(
+            game_active=self.stats.game_active,
+            ship_visible=not (self.stats.respawn_ticks // blink_ticks) % 2,
+            ship=(self.ship.prev_y, self.ship.y),
+            bullets=self.bullets.snapshot(),
+            targets=[(target, (target.prev_y, target.y))
+                for target in self.target.sprites()],
+        )
+
+    def _update_screen(self, alpha=1.0, snapshot=None):
+        """
+        Update images on the screen, and flip to the new screen.
+
+        alpha is how far the frame is between the last tick and the next.
+          The game is drawn as it is now, or as it was in snapshot.
+        """
+        if snapshot is None:
+            snapshot = self._take_snapshot()
+
+        # Only draw between the last two ticks while the game is moving.
+        if not snapshot.game_active:
+            alpha = 1.0
+
+        if self.renderer:
+            self.renderer.begin_frame((snapshot.game_active,
+                    self.profiler.version))
+        else:
+            self.screen.fill(self.settings.bg_color)
+
+        sprite_rects = []
+        if snapshot.ship_visible:
+            sprite_rects.append(self.ship.blitme(alpha, snapshot.ship))
+        sprite_rects += self.bullets.draw(self.screen, alpha, snapshot.bullets)
+        for target, position in snapshot.targets:
+            sprite_rects.append(target.draw_target(alpha, position))
+
+        # Draw the play button if the game is inactive.
+        overlay_rects = []
+        if not snapshot.game_active:
+            overlay_rects.append(self.play_button.draw_button())
+
+        # Draw the profiler overlay if it's turned on.
+        overlay_rects += self.profiler.draw_overlay(self.screen)
+        self.profiler.mark('draw')
+
+        if self.renderer:
+            self.renderer.end_frame(sprite_rects, overlay_rects)
+        elif self.scaled:
+            self.scaled.present()
+        elif not self.headless:
+            pygame.display.flip()
+
+        # Show the cursor whenever no game is being played.
+        self._set_mouse_visible(not snapshot.game_active)
+        self.latency.frame_shown()
+        self.startup.first_frame()
+        self.profiler.mark('flip')
+        self.profiler.end_frame(bullets=len(snapshot.bullets[0]),
+                targets=len(snapshot.targets))
+        self.metrics.frame_done(bullets=len(snapshot.bullets[0]),
+                targets=len(snapshot.targets))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play Target Practice.")
+    parser.add_argument('--startup-profile', action='store_true',
+            help="print how long each part of starting up took")
+    parser.add_argument('--quality', choices=('low', 'medium', 'high'),
+            help="play at a fixed size, scaled up to fill the display")
+    args = parser.parse_args()
+    settings = Settings()
+    settings.startup_profile = args.startup_profile
+    if args.quality:
+        settings.fixed_resolution = True
+        settings.render_quality = args.quality
+
+    # Make a game instance, and run the game.
+    tp = TargetPractice(settings=settings)
+    tp.run_game()
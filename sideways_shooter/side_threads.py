@@ -0,0 +1,98 @@
+import atexit
+import threading
+from time import perf_counter
+
+import pygame
+
+from side_clock import GameClock
+
+class SnapshotBuffer:
+    """
+    A double buffer of snapshots between the simulation and drawing.
+
+    The simulation builds each new snapshot on its own while drawing
+      reads the one published before it. Publishing swaps the new one in
+      with a single assignment, and snapshots are never changed once
+      built, so drawing always sees a whole tick and never a half-updated
+      one.
+    """
+
+    def __init__(self, snapshot, time):
+        """Publish the first snapshot, taken at time."""
+        self.front = (snapshot, time)
+
+    def publish(self, snapshot, time):
+        """Replace the published snapshot with one taken at time."""
+        self.front = (snapshot, time)
+
+    def latest(self):
+        """Return the published snapshot and the time it was taken."""
+        return self.front
+
+class SimulationThread(threading.Thread):
+    """
+    A thread that runs a game's ticks while the main thread draws.
+
+    Ticks run at the game's tick rate, and a snapshot of everything
+      drawing needs is published after each batch of them. Input is still
+      handled on the main thread, which holds lock while it does so that
+      it never changes the game in the middle of a tick.
+    """
+
+    def __init__(self, game):
+        """Prepare to simulate game, starting from its current state."""
+        super().__init__(name='simulation', daemon=True)
+        self.game = game
+        self.lock = threading.Lock()
+        self.tick_length = 1 / game.settings.tick_rate
+        self.snapshots = SnapshotBuffer(game._take_snapshot(), perf_counter())
+        self.running = True
+
+    def run(self):
+        """Run ticks as they fall due until the thread is stopped."""
+        game = self.game
+        clock = GameClock(game.settings, max_fps=game.settings.tick_rate)
+        while self.running:
+            ticks = clock.ticks_due()
+            if not ticks:
+                continue
+            with self.lock:
+                for _ in range(ticks):
+                    game._update_game()
+                snapshot = game._take_snapshot()
+
+            # Date the snapshot to when its last tick was due.
+            self.snapshots.publish(snapshot,
+                    clock.last_time - clock.lag)
+
+    def stop(self):
+        """Finish the tick in progress, and stop simulating."""
+        self.running = False
+        self.join()
+
+    def alpha(self, time):
+        """Return how far drawing now is past a snapshot's tick."""
+        return min(1.0, (perf_counter() - time) / self.tick_length)
+
+def run_threaded(game):
+    """
+    Run a game with its simulation on a thread of its own.
+
+    The main thread handles input and draws the latest snapshot, capped
+      at the game's frame rate, while the simulation thread keeps ticking.
+    """
+    simulation = SimulationThread(game)
+    simulation.start()
+    atexit.register(simulation.stop)
+
+    frame_clock = pygame.time.Clock()
+    while True:
+        frame_clock.tick(game.settings.max_fps)
+        game.profiler.start_frame()
+
+        with simulation.lock:
+            game._check_events()
+        game.profiler.mark('events')
+
+        snapshot, time = simulation.snapshots.latest()
+        game._update_screen(simulation.alpha(time), snapshot)
@@ -0,0 +1,63 @@
+"""
+Check that the leaderboard keeps every game it is given, and that a
+  broken database never stalls the game.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from side_leaderboard import Leaderboard
+
+def test_high_score_is_imported_once(tmp_path):
+    """The old score file's record is added once, however often it's read."""
+    score_file = tmp_path / 'high_score.json'
+    score_file.write_text(json.dumps(4200))
+    path = str(tmp_path / 'leaderboard.db')
+
+    leaderboard = Leaderboard(path)
+    leaderboard.import_high_score(str(score_file))
+    leaderboard.import_high_score(str(score_file))
+
+    # Opening the database again, as the next run does, adds nothing.
+    leaderboard = Leaderboard(path)
+    leaderboard.import_high_score(str(score_file))
+    assert leaderboard.count(0) == 1
+    assert leaderboard.count() == 1
+    assert leaderboard.best_score(0) == 4200
+
+def test_recorded_games_are_found_after_flush(tmp_path):
+    """Once flushed, recorded games show up in every lookup."""
+    leaderboard = Leaderboard(str(tmp_path / 'leaderboard.db'))
+    leaderboard.record(1, 3, 1500, 40.0)
+    leaderboard.record(2, 5, 3000, 90.0)
+    leaderboard.record(2, 2, 700, 20.5, completed=False)
+    leaderboard.flush()
+
+    assert [game.score for game in leaderboard.top()] == [3000, 1500, 700]
+    assert [game.score for game in leaderboard.top(difficulty=2)] == [
+            3000, 700]
+    assert leaderboard.top(difficulty=2)[1].completed is False
+    assert leaderboard.best_score() == 3000
+    assert leaderboard.best_score(1) == 1500
+    assert leaderboard.best_score(3) == 0
+    assert leaderboard.count(2) == 2
+
+def test_unopenable_database_drops_games(tmp_path, caplog):
+    """Games that can't be written are dropped with a warning."""
+    leaderboard = Leaderboard(str(tmp_path / 'leaderboard.db'))
+    # The writer opens its own connection, to a directory that's gone.
+    leaderboard.path = str(tmp_path / 'missing' / 'leaderboard.db')
+
+    with caplog.at_level(logging.WARNING, logger='side_leaderboard'):
+        leaderboard.record(1, 3, 1500, 40.0)
+        flushing = threading.Thread(target=leaderboard.flush, daemon=True)
+        flushing.start()
+        flushing.join(5)
+
+    assert not flushing.is_alive()
+    assert "Couldn't record 1 games" in caplog.text
+    assert leaderboard.count() == 0
@@ -0,0 +1,220 @@
+"""
+Check that the simulation's shortcuts give the same game as doing things
+  the slow, obvious way.
+
+Every game here is headless and runs under SDL's dummy drivers, so the
+  tests run anywhere without a display.
+"""
+import os
+import random
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pygame
+import pytest
+
+from side_settings import Settings
+from side_attack import SideAttack
+from side_target_practice import TargetPractice
+from side_fleet import _rect_round
+from side_replay import Replay
+
+# The keys a scripted player presses, fire most often of all.
+KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE, pygame.K_SPACE,
+        pygame.K_SPACE)
+
+def _brute_force_hits(fleet, box):
+    """Return the living aliens that overlap box, checking every one."""
+    return [i for i in range(len(fleet.x)) if fleet.alive[i] and
+            pygame.Rect(int(fleet.x[i]), _rect_round(fleet.y[i]),
+                fleet.width, fleet.height).colliderect(box)]
+
+def test_fleet_collisions_match_brute_force():
+    """The fleet's column broadphase finds exactly what checking all does."""
+    rng = random.Random(0)
+    game = SideAttack(headless=True)
+    game.start_game(3)
+    screen = game.screen.get_rect()
+
+    found = 0
+    for step in range(150):
+        inputs = ['fire', rng.choice(('up', 'down'))]
+        if not game.step(8, inputs):
+            game.start_game(3)
+
+        fleet = game.aliens
+        for _ in range(40):
+            width = rng.choice((game.bullets.width, 1, 60))
+            height = rng.choice((game.bullets.height, 1, 60))
+            box = pygame.Rect(rng.randrange(screen.width),
+                    rng.randrange(-height, screen.height), width, height)
+            hits = fleet._overlapping(box.left, box.top, box.right,
+                    box.bottom)
+            assert hits == _brute_force_hits(fleet, box)
+            assert fleet.collide_rect(box) == bool(hits)
+            found += bool(hits)
+
+    # Make sure the boxes hit something, and that aliens were destroyed
+    #   along the way.
+    assert found > 100
+    assert game.stats.score > 0
+
+def _record_session(path, Game, seed, ticks):
+    """
+    Play a recorded headless game with random input, and save it.
+
+    Input reaches the game the way _check_events() hands it on, between
+      ticks, with the odd pause thrown in.
+    """
+    settings = Settings()
+    settings.record_replay = str(path)
+    game = Game(headless=True, settings=settings)
+    rng = random.Random(seed)
+
+    button = getattr(game, 'hard_play_button', None) or game.play_button
+    game._check_play_button(button.rect.center)
+    while game.ticks < ticks:
+        if rng.random() < 0.1:
+            key = pygame.K_p if rng.random() < 0.01 else rng.choice(KEYS)
+            kind = rng.choice((pygame.KEYDOWN, pygame.KEYUP))
+            event = pygame.event.Event(kind, key=key)
+            game.recorder.record_event(event)
+            if kind == pygame.KEYDOWN:
+                game._check_keydown_events(event)
+            else:
+                game._check_keyup_events(event)
+        for _ in range(rng.randrange(1, 8)):
+            game._update_game()
+
+    game.recorder.save()
+    return game
+
+def _assert_same_state(game, other):
+    """Check that two games are in exactly the same state."""
+    state, other_state = game.save_state(), other.save_state()
+    assert state.tick == other_state.tick
+    np.testing.assert_array_equal(state.values, other_state.values)
+    for array, other_array in zip(state.bullets, other_state.bullets):
+        np.testing.assert_array_equal(array, other_array)
+    if isinstance(game, SideAttack):
+        for array, other_array in zip(state.sprites, other_state.sprites):
+            np.testing.assert_array_equal(array, other_array)
+
+@pytest.mark.parametrize('Game', (SideAttack, TargetPractice))
+def test_replay_matches_recording(Game, tmp_path):
+    """Replaying a recording ends the game exactly where it was."""
+    path = tmp_path / 'session.ssr'
+    recorded = _record_session(path, Game, seed=1, ticks=20000)
+    assert (recorded.stats.score > 0 or
+            recorded.stats.ships_left < recorded.settings.ship_limit)
+
+    replay = Replay(str(path))
+    replayed = replay.play()
+    assert replay.matches(replayed)
+    _assert_same_state(recorded, replayed)
+
+@pytest.mark.parametrize('Game', (SideAttack, TargetPractice))
+def test_seek_matches_playing_through(Game, tmp_path):
+    """Seeking from keyframes gives the same game as playing from the start."""
+    path = tmp_path / 'session.ssr'
+    _record_session(path, Game, seed=2, ticks=12000)
+
+    replay = Replay(str(path), keyframe_ticks=1000)
+    replay.play()
+    assert len(replay.keyframes) > 5
+
+    # Seek back and forth, reusing the game, and between keyframes.
+    game = None
+    for tick in (6500, 2999, 3000, 11999, 7, 6500, replay.end_tick):
+        game = replay.seek(tick, game)
+        _assert_same_state(game, Replay(str(path)).play(until=tick))
+
+@pytest.mark.parametrize('tick_rate', (60, 120, 480))
+def test_tick_rate_keeps_real_time_speeds(tick_rate):
+    """A second of play moves everything as far at any tick rate."""
+    moved = []
+    for rate in (240, tick_rate):
+        settings = Settings()
+        settings.tick_rate = rate
+        game = SideAttack(headless=True, settings=settings)
+        game.start_game(2)
+        ship_y, alien_y = game.ship.y, game.aliens.y.copy()
+        game.step(rate // 4, ['down', 'fire'])
+        # The first bullet was fired on the first tick.
+        moved.append((game.ship.y - ship_y, game.aliens.y - alien_y,
+                game.bullets.x[game.bullets.active]))
+
+    (ship, aliens, bullets), (other_ship, other_aliens, other_bullets) = moved
+    assert ship == pytest.approx(other_ship)
+    np.testing.assert_allclose(aliens, other_aliens)
+    assert bullets.max() == pytest.approx(other_bullets.max())
+
+def _fire_at_target(game, speed):
+    """Fire a single bullet at the target, and return True if it hits."""
+    game.settings.bullet_speed = speed
+    ships_left = game.stats.ships_left
+    game._fire_bullet()
+    while len(game.bullets):
+        game._update_game()
+    return game.stats.ships_left == ships_left
+
+@pytest.mark.parametrize('target_speed, speeds', (
+        (0, range(1, 2000, 7)), (2, range(60, 2000, 7))))
+def test_fast_bullets_hit_the_target(target_speed, speeds):
+    """Bullets hit the target however far they move in a single tick."""
+    game = TargetPractice(headless=True)
+    for speed in speeds:
+        game.start_game()
+        game.settings.target_speed = target_speed
+        assert _fire_at_target(game, speed), speed
+
+def test_swept_hits_include_overlaps():
+    """Every bullet that ends a tick overlapping the target has hit it."""
+    rng = random.Random(3)
+    game = TargetPractice(headless=True)
+    game.start_game()
+    bullets, target = game.bullets, game.target.sprites()[0]
+
+    overlaps = 0
+    for _ in range(5000):
+        # Let the target overshoot the edges of the screen, as it does
+        #   for a tick before turning around.
+        target.prev_y = rng.uniform(-40, 700)
+        target.y = target.prev_y + rng.uniform(-40, 40)
+        target.rect.y = target.y
+
+        bullets.empty()
+        bullets.fire((rng.randrange(target.rect.left - 40, 1250),
+                target.rect.top + rng.randrange(-20, 170)))
+        slot = bullets.slots()[0]
+        bullets.prev_x[slot] = bullets.x[slot] - rng.uniform(0, 300)
+        if bullets.rect(slot).colliderect(target.rect):
+            overlaps += 1
+            assert game._swept_hit(slot, target)
+    assert overlaps > 100
+
+def test_swept_hits_past_the_top():
+    """A target that overshot the top is swept from where it was drawn."""
+    game = TargetPractice(headless=True)
+    game.start_game()
+    bullets, target = game.bullets, game.target.sprites()[0]
+
+    # The target's bottom moves up from 139 to 138, so a bullet just
+    #   below it, crossing its left edge, never touches it.
+    target.prev_y, target.y = -10.6, -11.6
+    target.rect.y = target.y
+    assert target.rect.bottom == 138
+    bullets.fire((target.rect.left + 20, 140))
+    slot = bullets.slots()[0]
+    bullets.prev_x[slot] = target.rect.left - 20
+    assert bullets.rect(slot).top == 139
+    assert not game._swept_hit(slot, target)
+
+    # Moving down to a bottom of 140 instead, it touches as the move ends.
+    target.prev_y, target.y = -11.6, -9.6
+    target.rect.y = target.y
+    assert game._swept_hit(slot, target)